@@ -11,12 +11,25 @@ class CONF:
     ----------
     encoding: str
         default encoding used to parse files
+    encoding_detection: str
+        how the encoding of loaded files is detected (when no encoding is given to the loader):
+        'full' (default): analyse the whole file, 'head': only analyse the first encoding_detection_head_size bytes,
+        'off': use encoding.
+    encoding_detection_head_size: int
+        number of bytes analysed in 'head' encoding detection mode
     default_model_name: str
     external_files_suffix: str
     default_idd_version: int, int, int
+    idd_cache_dir_path: str or None
+        directory where parsed idds are pickled, so they don't need to be parsed again by new python processes
+        (for example: os.path.join(os.path.expanduser("~"), ".cache", "opyplus")). Cache files are rebuilt when idd
+        file, opyplus version or opyplus idd code changes. If None (default), disk cache is not used.
     """
 
     encoding = "latin-1"  # even needed for example files...
+    encoding_detection = "full"
+    encoding_detection_head_size = 64 * 1024
     default_model_name = "opyplus"
     external_files_suffix = "-external"
     default_idd_version = get_latest_idd_version()  # use if we create an empty epm without specifying version
+    idd_cache_dir_path = None
@@ -0,0 +1,97 @@
+"""Epgm dependency graph module."""
+import collections
+
+
+class DependencyGraph:
+    """
+    Dependency graph of Epgm records: a record depends on the records it points on.
+
+    The graph is a snapshot of the links of the Epgm (see Epgm.get_dependency_graph), it must be created again if
+    records or links are modified. Links pointing on tables (and not on records) are not part of the graph.
+
+    Parameters
+    ----------
+    records: tuple of opyplus.epgm.record.Record
+    pointed: tuple of tuple of int
+    pointable: tuple of bool
+
+    Attributes
+    ----------
+    records: tuple of opyplus.epgm.record.Record
+        graph nodes, a record is identified by its position in records
+    pointed: tuple of tuple of int
+        adjacency arrays: for each record, positions of the records it points on (sorted, without duplicates)
+    pointing: tuple of tuple of int
+        for each record, positions of the records pointing on it (sorted, without duplicates)
+    """
+
+    def __init__(self, records, pointed, pointable):
+        self.records = records
+        self.pointed = pointed
+        self._pointable = pointable
+
+        # reverse adjacency arrays (sources are visited in order, so positions are sorted)
+        pointing = tuple([] for _ in records)
+        for source, targets in enumerate(pointed):
+            for target in targets:
+                pointing[target].append(source)
+        self.pointing = tuple(tuple(sources) for sources in pointing)
+
+    def __len__(self):
+        """
+        Get number of records of graph.
+
+        Returns
+        -------
+        int
+        """
+        return len(self.records)
+
+    def get_orphans(self):
+        """
+        Get records that could be pointed (they have a reference field) but are not pointed by any record.
+
+        For example: unused constructions, materials or schedules.
+
+        Returns
+        -------
+        list of opyplus.epgm.record.Record
+        """
+        return [
+            record for record, pointable, sources in zip(self.records, self._pointable, self.pointing)
+            if pointable and len(sources) == 0
+        ]
+
+    def get_topological_order(self):
+        """
+        Get records ordered so that each record comes after all the records it points on.
+
+        Returns
+        -------
+        list of opyplus.epgm.record.Record
+
+        Raises
+        ------
+        ValueError
+            if records point on each other (cycle)
+        """
+        # Kahn algorithm: a record is ready when all the records it points on have been ordered
+        remaining_nb = [len(targets) for targets in self.pointed]
+        ready = collections.deque(position for position, nb in enumerate(remaining_nb) if nb == 0)
+        ordered = []
+        while len(ready) > 0:
+            position = ready.popleft()
+            ordered.append(position)
+            for source in self.pointing[position]:
+                remaining_nb[source] -= 1
+                if remaining_nb[source] == 0:
+                    ready.append(source)
+
+        if len(ordered) != len(self.records):
+            cycle_records = [self.records[position] for position, nb in enumerate(remaining_nb) if nb > 0]
+            raise ValueError(
+                f"Records point on each other and can't be ordered ({len(cycle_records)} records in or depending on "
+                f"cycles): {cycle_records[:10]}{'...' if len(cycle_records) > 10 else ''}"
+            )
+
+        return [self.records[position] for position in ordered]
@@ -20,11 +20,12 @@ from opyplus.util import get_multi_line_copyright_message, to_buffer, version_st
 from opyplus.idd.idd import Idd
 from opyplus.epgm.table import Table
 from opyplus.epgm.record import Record
+from opyplus.epgm.multi_table_queryset import MultiTableQueryset
 from opyplus.epgm.relations_manager import RelationsManager
 from opyplus.epgm.external_files_manager import ExternalFilesManager
 from opyplus.epgm.external_file import get_external_files_dir_name
 from opyplus.epgm.parse_idf import parse_idf
-from opyplus.epgm.util import json_data_to_json, multi_mode_write
+from opyplus.epgm.util import json_data_to_json, multi_mode_write, get_record_sort_key
 
 
 def default_external_files_dir_name(model_name):
@@ -65,6 +66,9 @@ class Epgm:
         If True, will raise an exception if a required field is missing. If False, not not perform any checks.
     idd_or_version: (expert) if you want to use a specific idd, you can require a specific version (x.x.x), or
         directly provide an IDD object.
+    trusted: boolean, default False
+        If True, json_data must have been written by opyplus: values are considered as already normalized and are not
+        validated (see load).
 
     Notes
     -----
@@ -95,7 +99,8 @@ class Epgm:
             json_data=None,
             check_required=True,
             check_length=True,
-            idd_or_version=None
+            idd_or_version=None,
+            trusted=False
     ):
         # prepare idd
         self._dev_idd = None
@@ -108,8 +113,12 @@ class Epgm:
                 raise TypeError(f"json_data must be a dict like, but '{type(json_data)}' was given")
             if "Version" in json_data and len(json_data["Version"]) > 0:
                 version_record = json_data["Version"][0]
-                if 0 in version_record:
+                if isinstance(version_record, list) and len(version_record) > 0:  # values by index
+                    version_str = version_record[0]
+                elif 0 in version_record:
                     version_str = version_record[0]
+                elif "0" in version_record:  # json keys are strings
+                    version_str = version_record["0"]
                 elif "version_identifier" in version_record:
                     version_str = version_record["version_identifier"]
                 else:
@@ -126,30 +135,31 @@ class Epgm:
         if self._dev_idd is None:
             self._dev_idd = self._dev_idd_cls._dev_get_from_cache(CONF.default_idd_version)
 
-        # !! relations manager must be defined before table creation because table creation will trigger
-        # hook registering
+        # prepare table descriptors (sorted), tables are only created when first accessed (see _dev_get_table)
+        if self._dev_restrict_table_refs is None:
+            # shared by all epgms using this idd, must not be modified
+            self._dev_table_descriptors = self._dev_idd._dev_sorted_table_descriptors
+        else:
+            self._dev_table_descriptors = collections.OrderedDict(
+                (table_lower_ref, table_descriptor)
+                for (table_lower_ref, table_descriptor) in self._dev_idd._dev_sorted_table_descriptors.items()
+                if table_lower_ref in self._dev_restrict_table_refs
+            )
+        self._tables = {}  # {lower_ref: table, ...}, only contains created tables
+
+        # !! relations manager must be defined after table descriptors, because it uses them to register table hooks
         self._dev_relations_manager = RelationsManager(self)
 
         # # external files manager
         self._dev_external_files_manager = ExternalFilesManager(self)
 
-        table_refs = self._dev_idd.table_descriptors.values()
-        if self._dev_restrict_table_refs is not None:
-            table_refs = [table_descriptor for table_descriptor in self._dev_idd.table_descriptors.values() if
-                          table_descriptor.table_ref.lower() in self._dev_restrict_table_refs]
-
-        self._tables = collections.OrderedDict(sorted([  # {lower_ref: table, ...}
-            (table_descriptor.table_ref.lower(), Table(table_descriptor, self))
-            for table_descriptor in table_refs
-        ]))
-
         self._dev_check_required = check_required
         self._dev_check_length = check_length
         self._comment = ""
 
         # load json_data if relevant
         if json_data is not None:
-            self._dev_populate_from_json_data(json_data)
+            self._dev_populate_from_json_data(json_data, trusted=trusted)
 
     # ------------------------------------------ private ---------------------------------------------------------------
     @classmethod
@@ -159,10 +169,12 @@ class Epgm:
             buffer_or_path,
             idd_or_version=None,
             check_required=True,
-            check_length=True
+            check_length=True,
+            encoding=None,
+            trusted=False
     ):
         # prepare buffer
-        _source_file_path, buffer = to_buffer(buffer_or_path)
+        _source_file_path, buffer = to_buffer(buffer_or_path, encoding=encoding)
 
         # create json data
         with buffer as f:
@@ -174,17 +186,31 @@ class Epgm:
             check_required=check_required,
             check_length=check_length,
             idd_or_version=idd_or_version,
+            trusted=trusted
         )
 
     # ------------------------------------------ dev api ---------------------------------------------------------------
-    def _dev_populate_from_json_data(self, json_data):
+    def _dev_get_table(self, table_lower_ref):
+        """Get table, create it if it was never accessed. Raises KeyError if table does not exist."""
+        try:
+            return self._tables[table_lower_ref]
+        except KeyError:
+            table = self._dev_table_cls(self._dev_table_descriptors[table_lower_ref], self)
+            self._tables[table_lower_ref] = table
+            return table
+
+    def _dev_iter_created_tables(self):
+        """Iterate (sorted) through tables that were already created (tables that were not created are empty)."""
+        return (self._tables[table_lower_ref] for table_lower_ref in sorted(self._tables))
+
+    def _dev_populate_from_json_data(self, json_data, trusted=False):
         """!! Must only be called once, when empty !!."""
         # workflow
         # --------
         # (methods belonging to create/update/delete framework:
         #     epgm._dev_populate_from_json_data, table.batch_add, record.update, queryset.delete, record.delete)
         # 1. add inert
-        #     * data is checked
+        #     * data is checked (unless trusted)
         #     * old links are unregistered
         #     * record is stored in table (=> id uniqueness is checked)
         # 2. activate: hooks, links, external files
@@ -205,18 +231,19 @@ class Epgm:
             table = getattr(self, table_ref)
 
             # create record (inert)
-            records = table._dev_add_inert(json_data_records)
+            records = table._dev_add_inert(json_data_records, trusted=trusted)
 
             # add records (inert)
             added_records.extend(records)
 
-        # activate hooks
+        # activate hooks and links
+        hooks, links = [], []
         for r in added_records:
-            r._dev_activate_hooks()
+            r._dev_collect_relations(hooks, links)
+        self._dev_relations_manager.bulk_register(hooks, links)
 
-        # activate links and external files
+        # activate external files
         for r in added_records:
-            r._dev_activate_links()
             r._dev_activate_external_files()
 
     # --------------------------------------------- public api ---------------------------------------------------------
@@ -241,7 +268,7 @@ class Epgm:
         """
         s = "Epgm\n"
 
-        for table in self._tables.values():
+        for table in self._dev_iter_created_tables():
             records_nb = len(table)
             if records_nb == 0:
                 continue
@@ -267,7 +294,7 @@ class Epgm:
         AttributeError
         """
         try:
-            return self._tables[item.lower()]
+            return self._dev_get_table(item.lower())
         except KeyError:
             raise AttributeError(f"No table with reference '{item}'.")
 
@@ -293,11 +320,11 @@ class Epgm:
         -------
         typing.Iterator[Table]
         """
-        return iter(self._tables.values())
+        return (self._dev_get_table(table_lower_ref) for table_lower_ref in self._dev_table_descriptors)
 
     def __dir__(self):
         """Attributes available for auto-completion: add the tables ref."""
-        return [t.get_ref() for t in self._tables.values()] + list(self.__dict__)
+        return [td.table_ref for td in self._dev_table_descriptors.values()] + list(self.__dict__)
 
     # get info
     def get_comment(self):
@@ -320,7 +347,7 @@ class Epgm:
         str
         """
         return "Energy plus model\n" + "\n".join(
-            f"  {table._dev_descriptor.table_ref}" for table in self._tables.values()
+            f"  {table_descriptor.table_ref}" for table_descriptor in self._dev_table_descriptors.values()
         )
 
     def get_external_files(self):
@@ -332,11 +359,47 @@ class Epgm:
         list of opyplus.epgm.external_file.ExternalFile
         """
         external_files = []
-        for table in self._tables.values():
+        for table in self._dev_iter_created_tables():
             for r in table:
                 external_files.extend([ef for ef in r.get_external_files()])
         return external_files
 
+    def get_dependency_closure(self, records, direction="pointed"):
+        """
+        Get given records and all the records they depend on, transitively (not only one hop, like
+        Record.get_pointed_records).
+
+        Parameters
+        ----------
+        records: iterable of opyplus.epgm.record.Record
+        direction: {"pointed", "pointing", "both"}
+            pointed (default): records pointed by given records, then records pointed by them, and so on (records that
+            are needed by given records, for example to extract a sub-model)
+            pointing: records pointing on given records, then records pointing on them, and so on (records that depend
+            on given records, for example to delete them)
+            both: follow links in both directions (connected records)
+
+        Returns
+        -------
+        MultiTableQueryset
+            including given records
+        """
+        closure = self._dev_relations_manager.get_dependency_closure(records, direction=direction)
+        return MultiTableQueryset(self, closure)
+
+    def get_dependency_graph(self):
+        """
+        Get dependency graph of records (a record depends on the records it points on).
+
+        Graph gives adjacency arrays, orphan records and topological order. It is a snapshot: it must be created again
+        if records are modified.
+
+        Returns
+        -------
+        opyplus.epgm.dependency_graph.DependencyGraph
+        """
+        return self._dev_relations_manager.get_dependency_graph()
+
     # construct
     def set_comment(self, comment):
         """
@@ -352,7 +415,7 @@ class Epgm:
 
     def set_defaults(self):
         """All fields of Epgm with a default value and that are null will be set to their default value."""
-        for table in self._tables.values():
+        for table in self._dev_iter_created_tables():
             for r in table:
                 r.set_defaults()
 
@@ -376,10 +439,13 @@ class Epgm:
             A dictionary of serialized data.
         """
         # create data
-        d = collections.OrderedDict((t.get_ref(), t.to_json_data()) for t in self._tables.values())
+        d = collections.OrderedDict(
+            (td.table_ref, self._tables[table_lower_ref].to_json_data() if table_lower_ref in self._tables else [])
+            for (table_lower_ref, td) in self._dev_table_descriptors.items()
+        )
         d["_comment"] = self._comment
         d.move_to_end("_comment", last=False)
-        d["_external_files"] = self._dev_external_files_manager
+        d["_external_files"] = self._dev_external_files_manager.get_json_data()
         return d
 
     # ------------------------------------------- save/load ------------------------------------------------------------
@@ -389,7 +455,9 @@ class Epgm:
             buffer_or_path,
             check_required=True,
             check_length=True,
-            idd_or_version=None
+            idd_or_version=None,
+            encoding=None,
+            trusted=False
     ):
         """
         Load Epgm from a file.
@@ -410,6 +478,13 @@ class Epgm:
         idd_or_version: tuple or Idd
             If you want to use a specific idd, you can require a specific version (x.x.x),
             or directly provide an IDD object.
+        encoding: str or None
+            file encoding (only used if buffer_or_path is a path). If None (default), encoding is detected (see
+            CONF.encoding_detection).
+        trusted: bool
+            If True, file must have been written by opyplus (read-modify-write workflows): values are considered as
+            already normalized (mono spaces, ASCII, lower case, length and required fields checked) and are only
+            converted to their type. Hooks, links and external files are registered as usual. Default False.
 
         Returns
         -------
@@ -419,7 +494,9 @@ class Epgm:
             buffer_or_path,
             check_required=check_required,
             check_length=check_length,
-            idd_or_version=idd_or_version
+            idd_or_version=idd_or_version,
+            encoding=encoding,
+            trusted=trusted
         )
 
     def save(self, buffer_or_path=None, dump_external_files=True):
@@ -448,7 +525,9 @@ class Epgm:
             buffer_or_path,
             check_required=True,
             check_length=True,
-            idd_or_version=None
+            idd_or_version=None,
+            encoding=None,
+            trusted=False
     ):
         """
         Create Epgm from a json file.
@@ -469,6 +548,11 @@ class Epgm:
         idd_or_version: Idd or tuple
             if you want to use a specific idd, you can require a specific version (x.x.x), or directly provide an IDD
             object.
+        encoding: str or None
+            file encoding (only used if buffer_or_path is a path). If None (default), encoding is detected (see
+            CONF.encoding_detection).
+        trusted: bool
+            If True, json must have been written by opyplus (see load). Default False.
 
         Returns
         -------
@@ -479,7 +563,9 @@ class Epgm:
             buffer_or_path,
             check_required=check_required,
             check_length=check_length,
-            idd_or_version=idd_or_version
+            idd_or_version=idd_or_version,
+            encoding=encoding,
+            trusted=trusted
         )
 
     def to_json(self, buffer_or_path=None, indent=2):
@@ -514,7 +600,9 @@ class Epgm:
             buffer_or_path,
             check_required=True,
             check_length=True,
-            idd_or_version=None
+            idd_or_version=None,
+            encoding=None,
+            trusted=False
     ):
         """See load."""
         return cls._create_from_buffer_or_path(
@@ -522,9 +610,24 @@ class Epgm:
             buffer_or_path,
             check_required=check_required,
             check_length=check_length,
-            idd_or_version=idd_or_version
+            idd_or_version=idd_or_version,
+            encoding=encoding,
+            trusted=trusted
         )
 
+    def _iter_epstf_chunks(self, comment, model_name):
+        yield comment
+        separator = ""
+        for table in self._dev_iter_created_tables():
+            records = (
+                table if table.get_ref().lower() in NON_SORTABLE_TABLE_REFS
+                else sorted(table, key=get_record_sort_key)
+            )
+            for r in records:
+                yield separator
+                yield r.to_epstf(model_name=model_name)
+                separator = "\n\n"
+
     def to_epstf(self, buffer_or_path=None, dump_external_files=True):
         """See save."""
         # prepare comment
@@ -546,19 +649,9 @@ class Epgm:
                 target_dir_path=os.path.join(dir_path, get_external_files_dir_name(model_name=model_name))
             )
 
-        # prepare body
-        formatted_records = []
-        for table_ref, table in self._tables.items():  # self._tables is already sorted
-            formatted_records.extend([
-                r.to_epstf(model_name=model_name)
-                for r in (table if table_ref in NON_SORTABLE_TABLE_REFS else sorted(table))
-            ])
-        body = "\n\n".join(formatted_records)
-
-        # return
-        content = comment + body
+        # return (records are written one by one, no full content string is built in buffer mode)
         return multi_mode_write(
-            lambda f: f.write(content),
-            lambda: content,
+            lambda f: f.writelines(self._iter_epstf_chunks(comment, model_name)),
+            lambda: "".join(self._iter_epstf_chunks(comment, model_name)),
             buffer_or_path
         )
@@ -3,6 +3,7 @@ import itertools
 import collections
 
 from .queryset import Queryset
+from .util import get_record_sort_key
 
 
 class MultiTableQueryset:
@@ -24,7 +25,7 @@ class MultiTableQueryset:
         # 2. we change from iterator to list
         d = {}
         # we sort records because groupby only groups consecutive items
-        for k, g in itertools.groupby(sorted(records), lambda x: x.get_table_ref()):
+        for k, g in itertools.groupby(sorted(records, key=get_record_sort_key), lambda x: x.get_table_ref()):
             _records = list(g)  # change from iterator to list (we need to access first element without breaking group)
             d[k.lower()] = Queryset(_records[0].get_table(), _records)
         self._querysets = collections.OrderedDict(sorted(d.items()))
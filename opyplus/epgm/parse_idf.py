@@ -1,7 +1,54 @@
 """Useful functions for parsing idf files."""
+import re
+
 from ..util import get_multi_line_copyright_message
 from ..idd.util import table_name_to_ref
 
+_comment_pattern = re.compile(r"!.*")
+
+_SPECIAL_TABLE_REFS = (
+    "lead input",
+    "end lead input",
+    "simulation data",
+    "end simulation data"
+)
+
+
+def _parse_head_comment(content):
+    # parses head comment (comments before first record, copyright lines excluded)
+    # returns head comment and position of first record line
+    copyright_list = get_multi_line_copyright_message().split("\n")
+    head_comment = ""
+    line_start = 0
+    line_num = 0
+    while line_start < len(content):
+        line_end = content.find("\n", line_start)
+        if line_end == -1:
+            line_end = len(content)
+        raw_line = content[line_start:line_end]
+        next_line_start = line_end + 1
+
+        # skip copyright line
+        if line_num < len(copyright_list) and raw_line.strip() == copyright_list[line_num]:
+            line_start, line_num = next_line_start, line_num + 1
+            continue
+
+        line_content, is_comment, comment = raw_line.partition("!")
+        line_content = line_content.strip()
+
+        # content: stop if record, skip if special table
+        if line_content != "":
+            table_name = line_content.split(",")[0].split(";")[0].strip()
+            if table_name_to_ref(table_name).lower() not in _SPECIAL_TABLE_REFS:
+                break
+        # comment line
+        elif is_comment:
+            head_comment += comment.strip() + "\n"
+
+        line_start, line_num = next_line_start, line_num + 1
+
+    return head_comment, line_start
+
 
 def parse_idf(file_like):
     """
@@ -19,95 +66,52 @@ def parse_idf(file_like):
     Returns
     -------
     dict
+        {table_ref: [record_values, ...], "_comment": head_comment}, where record_values is the list of the record's
+        raw field values (by field index)
+
+    Notes
+    -----
+    The whole buffer is read at once: comments are removed in one regex pass, and records are found by splitting on
+    semicolons (fields can't contain semicolons or commas).
     """
     # todo-later: manage record comments
-    tables_data = {}
-    head_comment = ""
-    record_data = None
-    make_new_record = True
+    content = file_like.read()
 
-    copyright_list = get_multi_line_copyright_message().split("\n")
+    # head comment
+    head_comment, body_start = _parse_head_comment(content)
 
-    for i, raw_line in enumerate(file_like):
-        # manage if copyright
-        try:
-            copyright_line = copyright_list[i]
-            if raw_line.strip() == copyright_line:
-                # skip copyright line
-                continue
-        except IndexError:
-            pass
-
-        # GET LINE CONTENT AND COMMENT
-        split_line = raw_line.split("!")
-
-        # no "!" in the raw_line
-        if len(split_line) == 1:
-            # this is an empty line
-            if len(split_line[0].strip()) == 0:
-                content, comment = None, None
-            # this is a record line with no comments
-            else:
-                content, comment = split_line[0].strip(), None
-        # there is at least one "!" in the raw_line
-        else:
-            # this is a comment line
-            if len(split_line[0].strip()) == 0:
-                content, comment = None, "!".join(split_line[1:])
-            # this is a record line with a comment
-            else:
-                content, comment = split_line[0].strip(), "!".join(split_line[1:])
-
-        # SKIP CURRENT LINE IF VOID
-        if (content, comment) == (None, None):
-            continue
+    # remove comments
+    body = _comment_pattern.sub("", content[body_start:])
 
-        # NO CONTENT
-        if not content:
-            if record_data is None:  # we only manage head idf comment
-                head_comment += comment.strip() + "\n"
+    # parse records
+    tables_data = {}
+    table_names_to_refs = {}  # table_name_to_ref is only called once per table (None if special table)
+    for raw_record in body.split(";"):
+        fields = raw_record.split(",")
+
+        # get table ref (skip if empty: end of file)
+        table_name = fields[0].strip()
+        if table_name == "":
+            continue
+        try:
+            table_ref = table_names_to_refs[table_name]
+        except KeyError:
+            table_ref = table_name_to_ref(table_name)
+            if table_ref.lower() in _SPECIAL_TABLE_REFS:
+                table_ref = None
+            table_names_to_refs[table_name] = table_ref
+
+        # skip if special table
+        if table_ref is None:
             continue
 
-        # CONTENT
-        # check if record end and prepare
-        record_end = content[-1] == ";"
-        content = content[:-1]  # we tear comma or semi-colon
-        content_l = [text.strip() for text in content.split(",")]
-
-        # record creation if needed
-        if make_new_record:
-            # get table ref
-            table_ref = table_name_to_ref(content_l[0].strip())
-
-            # skip if special table
-            if table_ref.lower() in (
-                    "lead input",
-                    "end lead input",
-                    "simulation data",
-                    "end simulation data"
-            ):
-                continue
-
-            # declare table if necessary
-            if table_ref not in tables_data:
-                tables_data[table_ref] = []
-
-            # create and store record
-            record_data = dict()
-            tables_data[table_ref].append(record_data)
-
-            # prepare in case fields on the same line
-            content_l = content_l[1:]
-            make_new_record = False
-
-        # fields
-        for value_s in content_l:
-            field_index = len(record_data)
-            record_data[field_index] = value_s
-
-        # signal that new record must be created
-        if record_end:
-            make_new_record = True
+        # store record
+        try:
+            records_data = tables_data[table_ref]
+        except KeyError:
+            records_data = []
+            tables_data[table_ref] = records_data
+        records_data.append(list(map(str.strip, fields[1:])))
 
     # add comment key
     tables_data["_comment"] = head_comment
@@ -2,6 +2,7 @@
 
 from itertools import filterfalse
 
+from .util import get_record_sort_key
 from ..exceptions import RecordDoesNotExistError, MultipleRecordsReturnedError
 
 
@@ -35,7 +36,7 @@ class Queryset:
     Contains record, and enables filtering or other operations.
 
     A queryset must be immutable (not a Python sense, but list must never be modified). OR CACHE SYSTEM WILL FAIL.
-    We only use lists (and not iterators), to avoid problems (could be done if optimization was needed):
+    We only use tuples (and not iterators), to avoid problems (could be done if optimization was needed):
         - exhaustion
         - iterator underlying list modification
     Optimization can probably be performed using iterators.
@@ -44,6 +45,11 @@ class Queryset:
     ----------
     table: opyplus.epgm.table.Table
     records: typing.Iterable[opyplus.epgm.record.Record]
+
+    Notes
+    -----
+    Querysets are sorted lazily: records are only sorted (by content) the first time order is observed (iteration,
+    indexing, export). Filtering, counting or deleting records does not sort them.
     """
 
     def __init__(self, table, records=None):
@@ -53,14 +59,44 @@ class Queryset:
         if records is None:
             records = ()
 
-        # ensure unique, sort, make un-mutable
-        self._records = tuple(sorted(_unique_ever_seen(records)))
+        # ensure unique, make un-mutable
+        self._unsorted_records = tuple(_unique_ever_seen(records))
+        self._sorted_records = None
+        self._records_set = None  # built on first id lookup
 
         # ensure correct table
-        if len({r.get_table() for r in self._records}.difference({self._table})) > 0:
-            raise RuntimeError(
-                f"queryset contains records that belong to other table than {self.get_table_ref()}"
-            )
+        for r in self._unsorted_records:
+            if r.get_table() is not table:
+                raise RuntimeError(
+                    f"queryset contains records that belong to other table than {self.get_table_ref()}"
+                )
+
+    @classmethod
+    def _dev_from_table_records(cls, table, records, is_sorted=False):
+        # records must be unique and belong to table (this is not checked)
+        qs = cls.__new__(cls)
+        qs._table = table
+        qs._unsorted_records = tuple(records)
+        qs._sorted_records = qs._unsorted_records if is_sorted else None
+        qs._records_set = None
+        return qs
+
+    def _get_record_by_id(self, record_id):
+        # ids may change (records can be renamed), so we don't store them: we use the table's id map and check that
+        # found record belongs to the queryset
+        if self._table._dev_no_pk:
+            raise KeyError(f"table {self._table.get_ref()} does not have a primary key, can't use getitem syntax")
+        if self._records_set is None:
+            self._records_set = set(self._unsorted_records)
+        record = self._table._dev_get_record_by_id(record_id)
+        if record is None or record not in self._records_set:
+            raise RecordDoesNotExistError(f"queryset does not contain a record who's id is '{record_id}'")
+        return record
+
+    def _get_sorted_records(self):
+        if self._sorted_records is None:
+            self._sorted_records = tuple(sorted(self._unsorted_records, key=get_record_sort_key))
+        return self._sorted_records
 
     # python magic
     def __repr__(self):
@@ -71,7 +107,7 @@ class Queryset:
         -------
         str
         """
-        return "<Queryset of %s: %s records>" % (self.get_table_ref(), str(len(self._records)))
+        return "<Queryset of %s: %s records>" % (self.get_table_ref(), str(len(self._unsorted_records)))
 
     def __getitem__(self, item):
         """
@@ -86,7 +122,10 @@ class Queryset:
         -------
         opyplus.epgm.record.Record
         """
-        return self._records[item]
+        # first record can be found without sorting
+        if self._sorted_records is None and isinstance(item, int) and item == 0 and self._unsorted_records:
+            return min(self._unsorted_records, key=get_record_sort_key)
+        return self._get_sorted_records()[item]
 
     def __iter__(self):
         """
@@ -96,7 +135,7 @@ class Queryset:
         -------
         typing.Iterator[opyplus.epgm.record.Record]
         """
-        return iter(self._records)
+        return iter(self._get_sorted_records())
 
     def __len__(self):
         """
@@ -106,7 +145,7 @@ class Queryset:
         -------
         int
         """
-        return len(self._records)
+        return len(self._unsorted_records)
 
     def __add__(self, other):
         """
@@ -134,7 +173,9 @@ class Queryset:
         -------
         bool
         """
-        return set(self) == set(other)
+        if isinstance(other, Queryset):
+            other = other._unsorted_records
+        return set(self._unsorted_records) == set(other)
 
     # get info
     def get_table(self):
@@ -173,8 +214,12 @@ class Queryset:
         -------
         Queryset instance, containing all selected records.
         """
-        iterator = self._records if filter_by is None else filter(filter_by, self._records)
-        return Queryset(self._table, iterator)
+        # records are already unique and belong to table, filtering keeps them sorted if they were
+        is_sorted = self._sorted_records is not None
+        records = self._sorted_records if is_sorted else self._unsorted_records
+        if filter_by is not None:
+            records = filter(filter_by, records)
+        return Queryset._dev_from_table_records(self._table, records, is_sorted=is_sorted)
 
     def one(self, filter_by=None):
         """
@@ -182,9 +227,10 @@ class Queryset:
 
         Parameters
         ----------
-        filter_by: callable, default None
-            Callable must take one argument (a record of table), and return True to keep record, or False to skip it.
-            Example : .one(lambda x: x.name == "my_name").
+        filter_by: typing.Callable or str, default None
+            if str: record id
+            if callable: a callable must take one argument (a record of table), and return True to keep record,
+            or False to skip it. Example : .one(lambda x: x.name == "my_name").
             If None, records are not filtered.
 
         Returns
@@ -201,12 +247,7 @@ class Queryset:
         """
         # filter if needed
         if isinstance(filter_by, str):
-            if self._table._dev_no_pk:
-                raise KeyError(f"table {self._table.get_ref()} does not have a primary key, can't use getitem syntax")
-            for r in self._records:  # later: we could store records in an ordered dict with id keys
-                if r.id == filter_by:
-                    return r
-            raise RecordDoesNotExistError(f"queryset does not contain a record who's id is '{filter_by}'")
+            return self._get_record_by_id(filter_by)
 
         qs = self if filter_by is None else self.select(filter_by=filter_by)
 
@@ -219,19 +260,57 @@ class Queryset:
         # return record
         return qs[0]
 
+    def get_many(self, ids):
+        """
+        Get records of this queryset from their ids.
+
+        Parameters
+        ----------
+        ids: typing.Iterable[str]
+            records ids
+
+        Returns
+        -------
+        typing.List[opyplus.epgm.record.Record]
+            records, in the same order as ids
+
+        Raises
+        ------
+        KeyError
+            if table does not have a primary key
+        RecordDoesNotExistError
+            if a record is not found
+        """
+        return [self._get_record_by_id(record_id) for record_id in ids]
+
     # delete
     def delete(self):
         """Delete all records in this queryset."""
         # workflow
         # --------
-        # delete each record and remove from queryset
+        # (methods belonging to create/update/delete framework:
+        #     epgm._dev_populate_from_json_data, table.batch_add, record.update, queryset.delete, record.delete)
+        # 1. unregister links and hooks of all records at once (fields of pointing records that are not deleted are
+        #    emptied)
+        # 2. delete each record inert (external files, table) and remove from queryset
+
+        # unregister links and hooks
+        hooks, links, external_files_by_record = [], [], []
+        for r in self._unsorted_records:
+            r_hooks, r_links, r_external_files = r._dev_get_relations()
+            hooks.extend(r_hooks)
+            links.extend(r_links)
+            external_files_by_record.append(r_external_files)
+        self._table.get_epgm()._dev_relations_manager.bulk_unregister(hooks, links)
 
         # delete each record
-        for r in self:
-            r.delete()
+        for r, r_external_files in zip(self._unsorted_records, external_files_by_record):
+            r._dev_delete_inert(r_external_files)
 
         # clear content
-        self._records = ()
+        self._unsorted_records = ()
+        self._sorted_records = ()
+        self._records_set = set()
 
     # ------------------------------------------- export ---------------------------------------------------------------
     def to_json_data(self):
@@ -242,5 +321,4 @@ class Queryset:
         -------
         list
         """
-        # records are already sorted
-        return [r.to_json_data() for r in self._records]
+        return [r.to_json_data() for r in self._get_sorted_records()]
@@ -4,15 +4,21 @@ import uuid
 import os
 import collections
 import textwrap
+import itertools
 
 from .link import Link, NONE_LINK
 from .record_hook import RecordHook, NONE_RECORD_HOOK
 from .external_file import ExternalFile, NONE_EXTERNAL_FILE, get_external_files_dir_name
+from .util import get_index_key
 from ..exceptions import FieldValidationError
 
 TAB_LEN = 4
 COMMENT_COLUMN_START = 35
 
+_DELETED_RECORD_SORT_KEY = ("",)  # lower than any table ref
+
+_RECORD_ATTRIBUTES = frozenset(("_table", "_data", "_comment", "_sort_key"))  # Record.__slots__, not managed as fields
+
 
 def _get_type_level(value):
     if value is None:  # lowest type
@@ -34,28 +40,43 @@ class Record:
     Parameters
     ----------
     table: opyplus.epgm.table.Table
-    data: dict or None
+    data: dict, list or None
         if dict, key: index_or_ref, value: raw value or value
+        if list, values by field index
+    trusted: bool, default False
+        if True, data was written by opyplus (idf or json): values are already normalized and are not validated (see
+        Epgm.load)
+
+    Notes
+    -----
+    Records use __slots__ (models may contain hundreds of thousands of records): attributes that are not declared in
+    __slots__ are considered as fields by __setattr__. Subclasses must therefore declare their own attributes in
+    __slots__.
     """
 
-    _initialized = False  # used by __setattr__
+    __slots__ = ("_table", "_data", "_comment", "_sort_key")
 
-    def __init__(self, table, data=None):
+    def __init__(self, table, data=None, trusted=False):
         self._table = table  # when record is deleted, __init__ fields are set to None
-        self._data = {}
+        # field values by index, None if field is empty. There are no trailing empty fields.
+        self._data = []
 
         # comment
         self._comment = ""
 
-        # signal initialized
-        self._initialized = True
+        # sort key cache (see _dev_get_sort_key), must be reset each time a serialized value changes
+        self._sort_key = None
 
         # set data if any
         if data is not None:
-            self._comment = data.pop("_comment", "")
-            self._update_inert(data)
+            if isinstance(data, dict):
+                self._comment = data.pop("_comment", "")
+            self._populate_inert(data, trusted=trusted)
 
     def _field_key_to_index(self, ref_or_index):
+        # json data keys are strings
+        if isinstance(ref_or_index, str) and ref_or_index.isdigit():
+            ref_or_index = int(ref_or_index)
         if isinstance(ref_or_index, int):
             if ref_or_index < 0:
                 ref_or_index += len(self)
@@ -65,11 +86,16 @@ class Record:
         return self._table._dev_descriptor.get_field_index(ref_or_index)
 
     def _update_inert(self, data):
-        # transform keys to indexes
-        data = dict([(self._field_key_to_index(k), v) for (k, v) in data.items()])
+        # data may be a list of values (by index, already ordered) or a dict
+        if isinstance(data, list):
+            items = enumerate(data)
+        else:
+            # transform keys to indexes
+            data = dict([(self._field_key_to_index(k), v) for (k, v) in data.items()])
+            items = sorted(data.items())
 
         # set values inert (must be ordered, otherwise some extensible values may be rejected by mistake)
-        for k, v in sorted(data.items()):
+        for k, v in items:
             self._update_value_inert(k, v)
 
         # leave if empty required fields are tolerated
@@ -77,9 +103,73 @@ class Record:
         if not self._table.get_epgm()._dev_check_required:
             return
 
-        # check required
+        self._check_required()
+
+    def _populate_inert(self, data, trusted=False):
+        # Bulk equivalent of _update_inert, for records being created (used by Table._dev_add_inert, so by
+        # Epm.load/from_json): there is no current value to unregister, no id update to signal and record is not
+        # indexed yet. Values are converted by precompiled field converters (see
+        # TableDescriptor._dev_get_field_converters). Trusted data is not validated (required fields are not checked).
+        table = self._table
+        descriptor = table._dev_descriptor
+        epgm = table.get_epgm()
+        converters = descriptor._dev_get_field_converters(epgm._dev_check_length, trusted=trusted)
+        cycle_start, cycle_len, _ = descriptor.extensible_info or (None, None, None)
+
+        # convert (converters return None for empty values)
+        if isinstance(data, list):
+            # data is a list of values (by index, already ordered)
+            if cycle_start is None:
+                if len(data) > len(converters):
+                    raise IndexError(
+                        f"Too many fields for table {descriptor.table_name}: {len(data)} (max {len(converters)}).")
+                iter_converters = converters
+            else:
+                # extensible fields are only described once
+                iter_converters = itertools.chain(converters[:cycle_start], itertools.cycle(converters[cycle_start:]))
+            values = [convert(value, index) for index, (convert, value) in enumerate(zip(iter_converters, data))]
+            pk_was_given = len(data) > 0
+        else:
+            # data is a dict, transform keys to indexes
+            data = dict([(self._field_key_to_index(k), v) for (k, v) in data.items()])
+            max_index = max(data) if len(data) > 0 else -1
+            if cycle_start is None and max_index >= len(converters):  # checked before allocating values
+                raise IndexError(
+                    f"index out of range for table {descriptor.table_name}: {max_index} (max {len(converters) - 1}).")
+            values = [None] * (max_index + 1)
+            for index, value in sorted(data.items()):  # sorted: errors are raised in fields order
+                reduced_index = index if cycle_start is None or index < cycle_start else \
+                    cycle_start + (index - cycle_start) % cycle_len
+                values[index] = converters[reduced_index](value, index)
+            pk_was_given = 0 in data
+
+        # check pk was not emptied
+        if pk_was_given and values[0] is None and not table._dev_no_pk:
+            self._dev_set_none_without_unregistering(0, check_not_required=False)  # raises
+
+        # remove trailing empty fields
+        while len(values) > 0 and values[-1] is None:
+            values.pop()
+        self._data = values
+
+        # leave if empty required fields are tolerated or if data is trusted
+        if trusted or not epgm._dev_check_required:
+            return
+
+        # fast check (errors are raised by _check_required)
+        values_nb = len(values)
+        base_required_indexes, extensible_required_indexes = descriptor._dev_get_required_indexes()
+        for i in base_required_indexes:
+            if i >= values_nb or values[i] is None:
+                self._check_required()
+        if len(extensible_required_indexes) > 0 or (not table._dev_no_pk and (values_nb == 0 or values[0] is None)):
+            self._check_required()
+
+    def _check_required(self):
+        # check that no required fields are missing
+        data_len = len(self._data)
         for i in range(len(self)):
-            if i in self._data:
+            if i < data_len and self._data[i] is not None:
                 continue
 
             # see if required field
@@ -93,6 +183,9 @@ class Record:
 
     def _update_value_inert(self, index, value):
         # Is only called by _update_inert.
+        # reset sort key
+        self._sort_key = None
+
         # get field descriptor
         field_descriptor = self._table._dev_descriptor.get_field_descriptor(index)
 
@@ -103,33 +196,39 @@ class Record:
         old_id = None
         if index == 0 and not self._table._dev_no_pk:
             # retrieve old value
-            old_value = self._data.get(0)  # we use get, because record may not have an id yet if it is being created
+            # record may not have an id yet if it is being created
+            old_value = self._data[0] if len(self._data) > 0 else None
 
             # manage record hooks (should not be any other special field)
             old_id = old_value.target_value if isinstance(old_value, RecordHook) else old_value
 
+        # current value
+        current_value = self._data[index] if index < len(self._data) else None
+
         # manage links
         if isinstance(value, Link):
             # de-activate current link if any
-            current_link = self._data.get(index)
+            current_link = current_value
             if current_link is not None:
                 current_link.unregister()
 
         # manage hooks
         if isinstance(value, RecordHook):
-            current_record_hook = self._data.get(index)
+            current_record_hook = current_value
             if current_record_hook is not None:
                 # unregister or update
                 if value is None:
                     current_record_hook.unregister()
                 else:
-                    # store old target value to signal table
-                    current_record_hook.update(value)
+                    # update current hook target value (it remains registered), so pointing records see the new
+                    # value as soon as the relations manager is informed
+                    current_record_hook.update(value.target_value)
+                    value = current_record_hook
 
         # manage external files
         if isinstance(value, ExternalFile):
             # unregister current external file if any
-            current_external_file = self._data.get(index)
+            current_external_file = current_value
             if current_external_file is not None:
                 current_external_file._dev_unregister()
 
@@ -140,13 +239,20 @@ class Record:
             return
 
         # set value
+        data_len = len(self._data)
+        if index >= data_len:
+            self._data.extend([None] * (index + 1 - data_len))
         self._data[index] = value
 
+        # signal table if field is indexed
+        if index in self._table._dev_indexes:
+            self._table._dev_record_field_was_updated(self, index)
+
         # signal id update if relevant
         if old_id is not None:
             self._table._dev_record_id_was_updated(old_id)
 
-    def _dev_set_none_without_unregistering(self, index, check_not_required=True):
+    def _dev_check_can_set_none(self, index, check_not_required=True):
         # get field descriptor
         field_descriptor = self._table._dev_descriptor.get_field_descriptor(index)
 
@@ -159,9 +265,21 @@ class Record:
             raise FieldValidationError(
                 f"Field is required (it is a pk). {field_descriptor.get_error_location_message()}")
 
+    def _dev_set_none_without_unregistering(self, index, check_not_required=True):
+        self._dev_check_can_set_none(index, check_not_required=check_not_required)
+
         # set none
-        if index in self._data:
-            del self._data[index]
+        if index < len(self._data):
+            self._data[index] = None
+            self._sort_key = None
+
+            # remove trailing empty fields
+            while len(self._data) > 0 and self._data[-1] is None:
+                self._data.pop()
+
+            # signal table if field is indexed
+            if index in self._table._dev_indexes:
+                self._table._dev_record_field_was_updated(self, index)
 
     def _prepare_pop_insert_index(self, index=None):
         if not self.is_extensible():
@@ -183,33 +301,87 @@ class Record:
 
         return index
 
-    def _unregister_hooks(self):
-        for v in self._data.values():
+    def _dev_get_sort_key(self):
+        # Records are sorted by table ref, then field by field (None < str < numbers). When both records have an empty
+        # field at the same position, they are considered as equal. Key is computed once and reset when a field is
+        # modified (or when a pointed record is renamed, see relations manager). Deleted records, that may still belong
+        # to querysets that were not sorted yet, come first (their data is lost, sort is stable).
+        if self._sort_key is None:
+            if self._table is None:
+                return _DELETED_RECORD_SORT_KEY
+            key = [self.get_table_ref()]
+            for i in range(len(self)):
+                value = self.get_serialized_value(i)
+                if value is None:
+                    key.append((0,))
+                    break
+                key.append((_get_type_level(value), value))
+            self._sort_key = tuple(key)
+        return self._sort_key
+
+    def _dev_link_target_was_updated(self, index):
+        # pointed record was renamed: serialized value of link has changed
+        self._sort_key = None
+        if index in self._table._dev_indexes:
+            self._table._dev_record_field_was_updated(self, index)
+
+    def _dev_get_index_key(self, index):
+        return get_index_key(self._data[index] if index < len(self._data) else None)
+
+    def _iter_values(self):
+        return (v for v in self._data if v is not None)
+
+    def _dev_get_relations(self):
+        # (hooks, links, external files), found in one pass when record is deleted. Hooks and links are unregistered in
+        # bulk (see RelationsManager.bulk_unregister), external files by _dev_delete_inert.
+        hooks, links, external_files = [], [], []
+        for v in self._iter_values():
             if isinstance(v, RecordHook):
-                v.unregister()
+                hooks.append(v)
+            elif isinstance(v, Link):
+                links.append(v)
+            elif isinstance(v, ExternalFile):
+                external_files.append(v)
+        return hooks, links, external_files
+
+    def _dev_delete_inert(self, external_files):
+        # Removes record from table, once its hooks and links have been unregistered.
+        # unregister external files
+        for external_file in external_files:
+            external_file._dev_unregister()
 
-    def _unregister_links(self):
-        for v in self._data.values():
-            if isinstance(v, Link):
-                v.unregister()
+        # tell table to remove without unregistering
+        self.get_table()._dev_remove_record_without_unregistering(self)
 
-    def _unregister_external_files(self):
-        for v in self._data.values():
-            if isinstance(v, ExternalFile):
-                v._dev_unregister()
+        # make stale
+        self._table = None
+        self._data = None
 
     def _dev_activate_hooks(self):
-        for v in self._data.values():
+        for v in self._iter_values():
             if isinstance(v, RecordHook):
                 v.activate(self)
 
     def _dev_activate_links(self):
-        for v in self._data.values():
+        for v in self._iter_values():
             if isinstance(v, Link):
                 v.activate(self)
 
+    def _dev_collect_relations(self, hooks, links):
+        # Bulk equivalent of _dev_activate_hooks and _dev_activate_links: owner of inactive hooks and links is set,
+        # they are appended to given lists and must be registered by caller (see RelationsManager.bulk_register).
+        for v in self._data:
+            if isinstance(v, RecordHook):
+                if v.target_record is None:
+                    v.target_record = self
+                    hooks.append(v)
+            elif isinstance(v, Link):
+                if v.source_record is None:
+                    v.source_record = self
+                    links.append(v)
+
     def _dev_activate_external_files(self):
-        for v in self._data.values():
+        for v in self._iter_values():
             if isinstance(v, ExternalFile):
                 v._dev_activate(self.get_epgm()._dev_external_files_manager)
 
@@ -270,7 +442,7 @@ class Record:
             raise IndexError("index out of range")
 
         # get value
-        value = self._data.get(item)
+        value = self._data[item] if item < len(self._data) else None
 
         # transform if hook or link
         if isinstance(value, RecordHook):
@@ -317,7 +489,7 @@ class Record:
         value
             value to set
         """
-        if name in self.__dict__ or not self._initialized:
+        if name in _RECORD_ATTRIBUTES:
             super().__setattr__(name, value)
             return
         self.update({name: value})
@@ -333,7 +505,7 @@ class Record:
         return [
                    f"f{i}" if fd.ref is None else fd.ref for
                    (i, fd) in enumerate(self._table._dev_descriptor.field_descriptors)
-               ] + list(self.__dict__)
+               ] + list(_RECORD_ATTRIBUTES)
 
     def __len__(self):
         """
@@ -343,7 +515,7 @@ class Record:
         -------
         int
         """
-        biggest_index = -1 if (len(self._data) == 0) else max(self._data)
+        biggest_index = len(self._data) - 1  # there are no trailing empty fields
 
         # manage extensible
         if self.is_extensible():
@@ -360,7 +532,7 @@ class Record:
 
     def __lt__(self, other):
         """
-        Compare two records.
+        Compare two records (using their sort keys).
 
         Parameters
         ----------
@@ -370,47 +542,7 @@ class Record:
         -------
         bool
         """
-        # compare tables
-        self_ref = self.get_table_ref()
-        other_ref = other.get_table_ref()
-        if self_ref < other_ref:
-            return True
-        if self_ref > other_ref:
-            return False
-
-        # get lengths
-        self_len = len(self)
-        other_len = len(other)
-        common_length = min(self_len, other_len)
-
-        # compare field by field
-        for i in range(common_length):
-            # values
-            self_value = self.get_serialized_value(i)
-            other_value = other.get_serialized_value(i)
-
-            # types
-            self_type_level = _get_type_level(self_value)
-            other_type_level = _get_type_level(other_value)
-
-            # different types
-            if self_type_level < other_type_level:
-                return True
-            if self_type_level > other_type_level:
-                return False
-
-            # None, None
-            if self_value is None:
-                return False
-
-            # different values
-            if self_value < other_value:
-                return True
-            if self_value > other_value:
-                return False
-
-        # equality on common fields, len will settle
-        return self_len <= other_len
+        return self._dev_get_sort_key() < other._dev_get_sort_key()
 
     @property
     def id(self):
@@ -485,7 +617,7 @@ class Record:
         )
 
         # get value
-        value = self._data.get(index)
+        value = self._data[index] if 0 <= index < len(self._data) else None
 
         # serialize
         value = value.serialize() if isinstance(value, (Link, RecordHook)) else value
@@ -527,7 +659,7 @@ class Record:
         list of opyplus.epgm.external_file.ExternalFile
             external files contained by record.
         """
-        return [v for v in self._data.values() if isinstance(v, ExternalFile)]
+        return [v for v in self._iter_values() if isinstance(v, ExternalFile)]
 
     # construct
     def update(self, data=None, **or_data):
@@ -588,18 +720,19 @@ class Record:
         # todo: [GL] check this really works, !! must not use same link, hook, external_file, ... for different records
         # no pk tables can just be copied
         if self._table._dev_no_pk:
-            return self._table.add(self._data)
+            return self._table.add(self.to_dict())
 
         # for ref pk tables, must manage name
         name = str(uuid.uuid4()) if new_name is None else new_name
-        new_data = dict((k, name if k == 0 else v) for (k, v) in self._data.items())
+        new_data = dict((k, name if k == 0 else v) for (k, v) in self.to_dict().items())
         return self._table.add(new_data)
 
     def set_defaults(self):
         """Set all empty fields for which a default value is defined to default value."""
         defaults = {}
+        data_len = len(self._data)
         for i in range(len(self)):
-            if i in self._data:
+            if i < data_len and self._data[i] is not None:
                 continue
             default = self.get_field_descriptor(i).tags.get("default", [None])[0]
             if default is not None:
@@ -699,24 +832,15 @@ class Record:
         # --------
         # (methods belonging to create/update/delete framework:
         #     epgm._dev_populate_from_json_data, table.batch_add, record.update, queryset.delete, record.delete)
-        # 1. unregister: links, hooks and external files
-        # 3. remove from table without unregistering
+        # 1. unregister: links and hooks (fields of pointing records are emptied), external files
+        # 2. remove from table without unregistering
 
-        # unregister links
-        self._unregister_links()
+        # unregister links and hooks
+        hooks, links, external_files = self._dev_get_relations()
+        self.get_epgm()._dev_relations_manager.bulk_unregister(hooks, links)
 
-        # unregister hooks
-        self._unregister_hooks()
-
-        # unregister external files
-        self._unregister_external_files()
-
-        # tell table to remove without unregistering
-        self.get_table()._dev_remove_record_without_unregistering(self)
-
-        # make stale
-        self._table = None
-        self._data = None
+        # unregister external files, remove from table and make stale
+        self._dev_delete_inert(external_files)
 
     # get idd info
     def get_field_descriptor(self, ref_or_index):
@@ -785,7 +909,7 @@ class Record:
         -------
         dict
         """
-        return collections.OrderedDict(sorted(self._data.items()))
+        return collections.OrderedDict((k, v) for (k, v) in enumerate(self._data) if v is not None)
 
     def to_json_data(self, model_name=None, named_keys=False):
         """
@@ -803,7 +927,9 @@ class Record:
         dict
             A dictionary of serialized data.
         """
-        data = {k: self.get_serialized_value(k, model_name=model_name) for k in self._data}
+        data = {
+            k: self.get_serialized_value(k, model_name=model_name) for (k, v) in enumerate(self._data) if v is not None
+        }
         if named_keys:
             data = {self._table._dev_descriptor.get_extended_ref(k): v for k, v in data.items()}
 
@@ -836,8 +962,8 @@ class Record:
         #   because some idd records are defined without extensibles (although they should used them), for example
         #   construction, and eplus does not know what to do... Because some example files (e.g.
         #   ASHRAE9012016_Warehouse_Denver.idf) have records for which len(self._data) == 0, we set field_nb to 1
-        #   in this case to prevent max of an empty arg to raise an error.
-        fields_nb = max(self._data) + 1 if len(self._data) else 1
+        #   in this case. _data has no trailing empty fields, so its length is max index + 1.
+        fields_nb = len(self._data) if len(self._data) else 1
         for i in range(fields_nb):
             # value
             tab = " " * TAB_LEN
@@ -1,6 +1,10 @@
 """Relation managers allow to handle links between different Epgm records (idf objects)."""
 
+import itertools
+import collections
+
 from .multi_table_queryset import MultiTableQueryset
+from .dependency_graph import DependencyGraph
 from ..exceptions import FieldValidationError
 
 
@@ -50,7 +54,11 @@ class RelationsManager:
 
     def __init__(self, epgm):
         self._epgm = epgm
-        self._table_hooks = {}  # {(hook_ref, table_lower_name): table, ...}
+        # tables are created lazily by epgm, we therefore store table refs (table hooks are given by idd)
+        self._table_hooks = {  # {(hook_ref, table_lower_name): table_lower_ref, ...}
+            k: table_lower_ref for (k, table_lower_ref) in epgm._dev_idd._dev_table_hooks.items()
+            if table_lower_ref in epgm._dev_table_descriptors
+        }
         self._record_hooks = {}  # {(hook_ref, value): hook, ...
         self._links_by_source = {}  # {source_record_or_table: links_set, ...}
         self._links_by_target = {}  # {target_record_or_table: links_set, ...}
@@ -69,13 +77,16 @@ class RelationsManager:
         """
         for key in hook.keys:
             if key in self._record_hooks:
-                field_descriptor = hook.target_record.get_field_descriptor(hook.target_index)
-                raise FieldValidationError(
-                    f"Reference key already exists, can't create: {key}. "
-                    f"{field_descriptor.get_error_location_message(hook.target_value, hook.target_index)}"
-                )
+                raise self._get_existing_key_error(hook, key)
             self._record_hooks[key] = hook
 
+    def _get_existing_key_error(self, hook, key):
+        field_descriptor = hook.target_record.get_field_descriptor(hook.target_index)
+        return FieldValidationError(
+            f"Reference key already exists, can't create: {key}. "
+            f"{field_descriptor.get_error_location_message(hook.target_value, hook.target_index)}"
+        )
+
     def record_hook_value_was_updated(self, hook, old_keys):
         """
         Handle record_hook value update.
@@ -89,22 +100,13 @@ class RelationsManager:
         for key in old_keys:
             del self._record_hooks[key]
 
+        # pointing records serialized values change
+        for link in self._links_by_target.get(hook.target_record, ()):
+            link.source_record._dev_link_target_was_updated(link.source_index)
+
         # register with new keys
         self.register_record_hook(hook)
 
-    def register_table_hook(self, references, table):
-        """
-        Register a new table hook.
-
-        Parameters
-        ----------
-        references: list of str
-        table: opyplus.epgm.table.Table
-        """
-        table_lower_name = table.get_name().lower()
-        for ref in references:
-            self._table_hooks[(ref, table_lower_name)] = table
-
     def register_link(self, link):
         """
         Register a new link.
@@ -130,7 +132,7 @@ class RelationsManager:
             for k in keys:
                 if k in self._table_hooks:
                     # set link target
-                    link.set_target(target_table=self._table_hooks[k])
+                    link.set_target(target_table=self._epgm._dev_get_table(self._table_hooks[k]))
                     break
             else:
                 field_descriptor = link.source_record.get_field_descriptor(link.source_index)
@@ -149,6 +151,107 @@ class RelationsManager:
             self._links_by_target[link.target] = set()
         self._links_by_target[link.target].add(link)
 
+    def bulk_register(self, hooks, links):
+        """
+        Register many record hooks, then many links (used after bulk loading and batch adding records).
+
+        Equivalent to registering hooks one by one, then links one by one, but keys and link sets are built in a few
+        passes. Errors of all links that could not be resolved are reported together.
+
+        Registration is atomic: if an error is raised, no hook nor link is registered, and given hooks and links are
+        deactivated (their target and source records are cleared), so they can be collected and registered again.
+
+        Parameters
+        ----------
+        hooks: list of opyplus.epgm.record_hook.RecordHook
+            target records must have been set
+        links: list of opyplus.epgm.link.Link
+            source records and indexes must have been set
+
+        Raises
+        ------
+        FieldValidationError
+            if a record hook key already exists, or if links could not be resolved
+        """
+        # record hooks
+        new_record_hooks = {(ref, hook.target_value): hook for hook in hooks for ref in hook.references}
+        if (
+                len(new_record_hooks) != sum(len(hook.references) for hook in hooks) or
+                not self._record_hooks.keys().isdisjoint(new_record_hooks)
+        ):
+            # a key is used twice, find first one to raise same error as register_record_hook
+            keys = set()
+            for hook in hooks:
+                for key in hook.keys:
+                    if key in self._record_hooks or key in keys:
+                        error = self._get_existing_key_error(hook, key)
+                        self._deactivate(hooks, links)
+                        raise error
+                    keys.add(key)
+        self._record_hooks.update(new_record_hooks)
+
+        # resolve link targets
+        record_hooks = self._record_hooks
+        errors = []
+        for link in links:
+            value = link.initial_hook_value
+
+            # look for a record hook
+            for ref in link.hook_references:
+                hook = record_hooks.get((ref, value))
+                if hook is not None:
+                    link.target_record = hook.target_record
+                    break
+            else:
+                # look for a table hook
+                for ref in link.hook_references:
+                    table_lower_ref = self._table_hooks.get((ref, value))
+                    if table_lower_ref is not None:
+                        link.target_table = self._epgm._dev_get_table(table_lower_ref)
+                        break
+                else:
+                    keys = tuple((ref, value) for ref in link.hook_references)
+                    field_descriptor = link.source_record.get_field_descriptor(link.source_index)
+                    errors.append(
+                        f"No object found with any of given references : {keys}. "
+                        f"{field_descriptor.get_error_location_message(value)}"
+                    )
+        if len(errors) > 0:
+            # roll back record hooks
+            for key in new_record_hooks:
+                del record_hooks[key]
+            self._deactivate(hooks, links)
+            if len(errors) == 1:
+                raise FieldValidationError(errors[0])
+            raise FieldValidationError(f"{len(errors)} links could not be resolved:\n - " + "\n - ".join(errors))
+
+        # store links by source and by target
+        links_by_source = self._links_by_source
+        links_by_target = self._links_by_target
+        for link in links:
+            # clear initial hook value to prevent future incorrect use
+            link.initial_hook_value = None
+
+            source_links = links_by_source.get(link.source_record)
+            if source_links is None:
+                source_links = links_by_source[link.source_record] = set()
+            source_links.add(link)
+
+            target = link.target_record if link.target_table is None else link.target_table
+            target_links = links_by_target.get(target)
+            if target_links is None:
+                target_links = links_by_target[target] = set()
+            target_links.add(link)
+
+    def _deactivate(self, hooks, links):
+        # clear owners and targets of hooks and links that could not be registered
+        for hook in hooks:
+            hook.target_record = None
+        for link in links:
+            link.source_record = None
+            link.target_record = None
+            link.target_table = None
+
     def unregister_record_hook(self, hook):
         """
         Unregister a record hook.
@@ -157,17 +260,66 @@ class RelationsManager:
         ----------
         hook: opyplus.epgm.record_hook.RecordHook
         """
-        # find records pointing on record hook
-        for link in self._links_by_target.get(hook.target_record, set()).copy():
-            # set link field to none on source record
-            link.source_record._dev_set_none_without_unregistering(link.source_index)
+        self.bulk_unregister([hook], [])
 
-            # unregister link
-            link.unregister()
+    def bulk_unregister(self, hooks, links):
+        """
+        Unregister many links, then many record hooks (used when deleting records).
 
-        # unregister record hook
-        for key in hook.keys:
-            self._record_hooks.pop(key)
+        Fields of records pointing on unregistered record hooks are emptied, unless their link is also being
+        unregistered (records deleted together). Pointing links are found once, and pointing fields are checked before
+        anything is modified.
+
+        Parameters
+        ----------
+        hooks: list of opyplus.epgm.record_hook.RecordHook
+        links: list of opyplus.epgm.link.Link
+
+        Raises
+        ------
+        FieldValidationError
+            if a pointing field can't be emptied (required field). Nothing is modified.
+        """
+        links_by_source = self._links_by_source
+        links_by_target = self._links_by_target
+
+        # find links pointing on hooks records, that are not unregistered
+        unregistered_links = set(links)
+        targets = dict.fromkeys(hook.target_record for hook in hooks)  # ordered set
+        pointing_links = [
+            link for target in targets for link in links_by_target.get(target, ())
+            if link not in unregistered_links
+        ]
+
+        # check pointing fields can be emptied
+        for link in pointing_links:
+            link.source_record._dev_check_can_set_none(link.source_index)
+
+        # empty pointing fields
+        for link in pointing_links:
+            link.source_record._dev_set_none_without_unregistering(link.source_index, check_not_required=False)
+
+        # remove links (links pointing on hooks records are removed at once)
+        for target in targets:
+            links_by_target.pop(target, None)
+        for link in itertools.chain(pointing_links, links):
+            source_links = links_by_source[link.source_record]
+            source_links.remove(link)
+            if len(source_links) == 0:
+                del links_by_source[link.source_record]
+
+            target = link.target
+            if target in targets:
+                continue
+            target_links = links_by_target[target]
+            target_links.remove(link)
+            if len(target_links) == 0:
+                del links_by_target[target]
+
+        # unregister record hooks
+        for hook in hooks:
+            for key in hook.keys:
+                self._record_hooks.pop(key)
 
     def unregister_link(self, link):
         """
@@ -218,3 +370,62 @@ class RelationsManager:
             self._epgm,
             (link.target_record for link in self._links_by_source.get(source_record, set()))
         )
+
+    def get_dependency_closure(self, records, direction="pointed"):
+        """
+        Get given records and all the records they depend on (transitively), walking links index.
+
+        Parameters
+        ----------
+        records: iterable of opyplus.epgm.record.Record
+        direction: {"pointed", "pointing", "both"}
+            pointed (default): records pointed by given records, then records pointed by them, and so on
+            pointing: records pointing on given records, then records pointing on them, and so on
+            both: follow links in both directions (connected records)
+
+        Returns
+        -------
+        list of opyplus.epgm.record.Record
+            given records first, then other records in breadth first order
+        """
+        if direction not in ("pointed", "pointing", "both"):
+            raise ValueError(f"unknown direction: '{direction}', expected 'pointed', 'pointing' or 'both'")
+        follow_pointed = direction in ("pointed", "both")
+        follow_pointing = direction in ("pointing", "both")
+
+        closure = dict.fromkeys(records)  # ordered set
+        queue = collections.deque(closure)
+        while len(queue) > 0:
+            record = queue.popleft()
+            neighbours = []
+            if follow_pointed:
+                neighbours.extend(link.target_record for link in self._links_by_source.get(record, ()))
+            if follow_pointing:
+                neighbours.extend(link.source_record for link in self._links_by_target.get(record, ()))
+            for neighbour in neighbours:
+                # target record is None if link points on a table
+                if neighbour is not None and neighbour not in closure:
+                    closure[neighbour] = None
+                    queue.append(neighbour)
+
+        return list(closure)
+
+    def get_dependency_graph(self):
+        """
+        Get dependency graph of all epgm records, built from links index.
+
+        Returns
+        -------
+        opyplus.epgm.dependency_graph.DependencyGraph
+        """
+        records = tuple(record for table in self._epgm._dev_iter_created_tables() for record in table)
+        position_by_record = {record: position for position, record in enumerate(records)}
+        pointed = tuple(
+            tuple(sorted({
+                position_by_record[link.target_record] for link in self._links_by_source.get(record, ())
+                if link.target_record is not None
+            }))
+            for record in records
+        )
+        pointable_records = {hook.target_record for hook in self._record_hooks.values()}
+        return DependencyGraph(records, pointed, tuple(record in pointable_records for record in records))
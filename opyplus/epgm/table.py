@@ -2,6 +2,7 @@
 
 from .record import Record
 from .queryset import Queryset
+from .util import get_record_sort_key, get_index_key
 from ..exceptions import FieldValidationError, RecordDoesNotExistError
 
 
@@ -72,6 +73,10 @@ class Table:
         self._epgm = epgm
         self._records = dict()
 
+        # secondary indexes (see create_index): {field_index: ({key: {record: None, ...}}, {record: key})}
+        # records are stored in dicts (and not sets) to keep a deterministic order
+        self._dev_indexes = dict()
+
         # no pk if first field is not a required reference
         self._dev_no_pk = not (
                 (table_descriptor.field_descriptors[0].detailed_type == "reference") and
@@ -81,11 +86,6 @@ class Table:
         # monkey-patch add
         self.add = _get_documented_add(self, self._dev_descriptor.field_descriptors)
 
-        # register table hooks
-        table_hooks_references = self._dev_descriptor.field_descriptors[0].tags.get("reference-class-name")
-        if table_hooks_references is not None:
-            self._epgm._dev_relations_manager.register_table_hook(table_hooks_references, self)
-
     def _dev_record_id_was_updated(self, old_id):
         # remove old id
         record = self._records.pop(old_id)
@@ -100,27 +100,73 @@ class Table:
         # store with new id
         self._records[new_id] = record
 
-    def _dev_add_inert(self, records_data):
+    def _dev_add_inert(self, records_data, trusted=False, stored=None):
         # Inert: hooks and links are not activated.
+        # Trusted: records data was written by opyplus and is not validated (see Epgm.load).
+        # Stored: if a list is given, (record, replaced record or None) couples are appended as soon as records are
+        # stored, so that add can be rolled back even if it fails (see _dev_remove_added_inert).
         added_records = []
         for r_data in records_data:
             # create record
             record = Record(
                 self,
-                data=r_data
+                data=r_data,
+                trusted=trusted
             )
 
             # store
             # we don't check uniqueness here => will be done while checking hooks
+            replaced_record = self._records.get(record.id)
             self._records[record.id] = record
 
+            # index
+            for field_index in self._dev_indexes:
+                self._index_record(record, field_index)
+
             # remember record
             added_records.append(record)
+            if stored is not None:
+                stored.append((record, replaced_record))
 
         return added_records
 
+    def _dev_remove_added_inert(self, stored):
+        # Rolls back _dev_add_inert (hooks and links must not have been registered).
+        # reverse order: a record may have replaced a record added before it
+        for record, replaced_record in reversed(stored):
+            record._dev_delete_inert(())
+            if replaced_record is not None:
+                self._records[replaced_record.id] = replaced_record
+
+    def _dev_get_record_by_id(self, record_id):
+        return self._records.get(record_id)
+
     def _dev_remove_record_without_unregistering(self, record):
         del self._records[record.id]
+        for field_index in self._dev_indexes:
+            self._unindex_record(record, field_index)
+
+    def _index_record(self, record, field_index):
+        records_by_key, key_by_record = self._dev_indexes[field_index]
+        key = record._dev_get_index_key(field_index)
+        records_by_key.setdefault(key, {})[record] = None
+        key_by_record[record] = key
+
+    def _unindex_record(self, record, field_index):
+        records_by_key, key_by_record = self._dev_indexes[field_index]
+        key = key_by_record.pop(record)
+        records = records_by_key[key]
+        del records[record]
+        if len(records) == 0:
+            del records_by_key[key]
+
+    def _dev_record_field_was_updated(self, record, field_index):
+        # field must be indexed
+        # only records that were already indexed are updated (records being created are indexed by _dev_add_inert)
+        if record not in self._dev_indexes[field_index][1]:
+            return
+        self._unindex_record(record, field_index)
+        self._index_record(record, field_index)
 
     # --------------------------------------------- public api ---------------------------------------------------------
     def __repr__(self):
@@ -144,7 +190,8 @@ class Table:
         header = f"Table {self.get_name()} ({self.get_ref()})"
         if self._dev_no_pk:
             return header.strip()
-        return (header + "\n" + "\n".join(f"  {record.id}" for record in sorted(self._records.values()))).strip()
+        records = sorted(self._records.values(), key=get_record_sort_key)
+        return (header + "\n" + "\n".join(f"  {record.id}" for record in records)).strip()
 
     def __getitem__(self, item):
         """
@@ -235,8 +282,9 @@ class Table:
         -------
         Queryset
         """
+        # table records are unique and belong to table: no need to check
         records = self._records.values() if filter_by is None else filter(filter_by, self._records.values())
-        return Queryset(self, records=records)
+        return Queryset._dev_from_table_records(self, records)
 
     def one(self, filter_by=None):
         """
@@ -271,7 +319,68 @@ class Table:
             except KeyError:
                 raise RecordDoesNotExistError(
                     f"table {self.get_ref()} does not contain a record who's id is '{filter_by}'")
-        return Queryset(self, records=self._records.values()).one(filter_by=filter_by)
+        return self.select().one(filter_by=filter_by)
+
+    def create_index(self, ref_or_index):
+        """
+        Create an index on a field, to speed up equality lookups performed with filter.
+
+        The index is kept up to date when records are added, modified or deleted. Creating an index on an already
+        indexed field has no effect.
+
+        Parameters
+        ----------
+        ref_or_index: str or int
+            field lowercase name or index
+        """
+        field_index = (
+            self._dev_descriptor.get_field_index(ref_or_index) if isinstance(ref_or_index, str) else ref_or_index
+        )
+        if field_index in self._dev_indexes:
+            return
+        self._dev_indexes[field_index] = (dict(), dict())
+        for record in self._records.values():
+            self._index_record(record, field_index)
+
+    def filter(self, **or_data):
+        """
+        Select records from Table whose fields are equal to given values.
+
+        Indexed fields (see create_index) are looked up directly, other fields are compared record by record.
+        Values are compared as they would be stored (for example, strings are lower case if the field does not retain
+        case).
+
+        Parameters
+        ----------
+        or_data: keyword arguments containing field names as keys, and searched values as values.
+            Example: .filter(zone_name="zone 1").
+
+        Returns
+        -------
+        Queryset
+        """
+        # prepare keys
+        keys = []
+        for ref, value in or_data.items():
+            field_index = self._dev_descriptor.get_field_index(ref)
+            field_descriptor = self._dev_descriptor.get_field_descriptor(field_index)
+            value = field_descriptor.deserialize(value, field_index, check_length=False)
+            keys.append((field_index, get_index_key(value)))
+
+        # use smallest index, if any
+        records = self._records.values()
+        indexed_keys = [(field_index, key) for (field_index, key) in keys if field_index in self._dev_indexes]
+        if len(indexed_keys) > 0:
+            records = min(
+                (self._dev_indexes[field_index][0].get(key, {}) for (field_index, key) in indexed_keys),
+                key=len
+            )
+
+        # check all keys
+        return Queryset._dev_from_table_records(
+            self,
+            [r for r in records if all(r._dev_get_index_key(field_index) == key for (field_index, key) in keys)]
+        )
 
     # construct
     # def add(self, data=None, **or_data):
@@ -284,9 +393,9 @@ class Table:
 
         Parameters
         ----------
-        records_data: typing.List[typing.Dict[typing.Union[str, int], dict]]
+        records_data: typing.List[typing.Union[typing.Dict[typing.Union[str, int], dict], list]]
             list of dictionaries containing records data. Keys of dictionary may be field names and/or field
-            indexes
+            indexes. Records data may also be given as lists of values (by field index).
 
         Returns
         -------
@@ -303,19 +412,27 @@ class Table:
         #     * record is stored in table (=> id uniqueness is checked)
         # 2. activate: hooks, links, external files
 
-        # add inert
-        added_records = self._dev_add_inert(records_data)
-
-        # activate hooks
-        for r in added_records:
-            r._dev_activate_hooks()
-
-        # activate links and external files
+        stored = []
+        try:
+            # add inert
+            added_records = self._dev_add_inert(records_data, stored=stored)
+
+            # activate hooks and links
+            hooks, links = [], []
+            for r in added_records:
+                r._dev_collect_relations(hooks, links)
+            self.get_epgm()._dev_relations_manager.bulk_register(hooks, links)
+        except Exception:
+            # nothing was registered (see RelationsManager.bulk_register), remove added records so that epgm is left
+            # unchanged
+            self._dev_remove_added_inert(stored)
+            raise
+
+        # activate external files
         for r in added_records:
-            r._dev_activate_links()
             r._dev_activate_external_files()
 
-        return Queryset(self, records=added_records)
+        return Queryset._dev_from_table_records(self, added_records)
 
     # delete
     def delete(self):
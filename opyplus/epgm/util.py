@@ -1,6 +1,9 @@
 """Util functions for opyplus epgm package."""
 import json
 
+from .link import Link
+from .record_hook import RecordHook
+from .external_file import ExternalFile
 from ..util import multi_mode_write
 
 
@@ -26,3 +29,44 @@ def json_data_to_json(json_data, buffer_or_path=None, indent=2):
         lambda: json.dumps(json_data, indent=indent),
         buffer_or_path=buffer_or_path
     )
+
+
+def get_record_sort_key(record):
+    """
+    Get record sort key, to be used as key argument of sorted.
+
+    Sorting with keys is much faster than using Record.__lt__, because keys are cached by records and compared in C.
+
+    Parameters
+    ----------
+    record: opyplus.epgm.record.Record
+
+    Returns
+    -------
+    tuple
+    """
+    return record._dev_get_sort_key()
+
+
+def get_index_key(value):
+    """
+    Get the key used by table indexes to store a deserialized field value.
+
+    Links are indexed by their target name (or by their initial hook value if they are not activated yet), record
+    hooks by their target value and external files by their naive short ref.
+
+    Parameters
+    ----------
+    value: deserialized field value
+
+    Returns
+    -------
+    str, int, float or None
+    """
+    if isinstance(value, Link):
+        return value.initial_hook_value if value.source_record is None else value.serialize()
+    if isinstance(value, RecordHook):
+        return value.target_value
+    if isinstance(value, ExternalFile):
+        return value.naive_short_ref
+    return value
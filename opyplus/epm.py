@@ -55,6 +55,9 @@ class Epm(Epgm):
         If True, will raise an exception if a required field is missing. If False, not not perform any checks.
     idd_or_version: (expert) if you want to use a specific idd, you can require a specific version (x.x.x), or
         directly provide an IDD object.
+    trusted: boolean, default False
+        If True, json_data must have been written by opyplus: values are considered as already normalized and are not
+        validated (see load).
 
     Notes
     -----
@@ -69,13 +72,14 @@ class Epm(Epgm):
         - else will use default eplus version used in conf, which is initially set to latest available idd version
     """
 
-    def __init__(self, json_data=None, check_required=True, check_length=True, idd_or_version=None):
+    def __init__(self, json_data=None, check_required=True, check_length=True, idd_or_version=None, trusted=False):
         # call super
         super().__init__(
             json_data=json_data,
             check_required=check_required,
             check_length=check_length,
-            idd_or_version=idd_or_version
+            idd_or_version=idd_or_version,
+            trusted=trusted
         )
 
     # --------------------------------------------- public api ---------------------------------------------------------
@@ -100,7 +104,7 @@ class Epm(Epgm):
         """
         s = "Epm\n"
 
-        for table in self._tables.values():
+        for table in self._dev_iter_created_tables():
             records_nb = len(table)
             if records_nb == 0:
                 continue
@@ -117,16 +121,20 @@ class Epm(Epgm):
             buffer_or_path,
             check_required=True,
             check_length=True,
-            idd_or_version=None
+            idd_or_version=None,
+            encoding=None,
+            trusted=False
     ):
         """See load."""
         return cls().from_epstf(
             buffer_or_path,
             check_required,
             check_length,
-            idd_or_version
+            idd_or_version,
+            encoding,
+            trusted=trusted
         )
 
     def to_idf(self, buffer_or_path=None, dump_external_files=True):
         """See save."""
-        self.to_epstf(buffer_or_path, dump_external_files)
+        return self.to_epstf(buffer_or_path, dump_external_files)
@@ -1,24 +1,40 @@
 """Idd field_descriptor module."""
 import re
+import functools
 import unidecode
 
 from ..exceptions import FieldValidationError
 from ..epgm.record import Record
 from ..epgm.link import Link, NONE_LINK
 from ..epgm.record_hook import RecordHook, NONE_RECORD_HOOK
-from ..epgm.external_file import ExternalFile
+from ..epgm.external_file import ExternalFile, NONE_EXTERNAL_FILE
 from .util import isinstance_str
 
 MAX_FIELD_LENGTH = 100
 
-spaces_and_newlines_pattern = re.compile(r"[\n\r\s]+")
 not_python_var_pattern = re.compile(r"(^[^\w]+)|([^\w\d]+)")
 multiple_underscores_pattern = re.compile(r"[_]{2,}")
 
+# deserialized empty values (links, hooks and external files do not define __eq__: membership is checked by identity)
+_EMPTY_VALUES = (None, NONE_RECORD_HOOK, NONE_LINK, NONE_EXTERNAL_FILE)
 
+# {detailed_type: (typed deserializer method name, deserialized none value), ...}
+_TYPED_DESERIALIZERS = {
+    "integer": ("_deserialize_integer", None),
+    "real": ("_deserialize_real", None),
+    "alpha": ("_deserialize_string", None),
+    "choice": ("_deserialize_string", None),
+    "node": ("_deserialize_string", None),
+    "external-list": ("_deserialize_string", None),
+    "reference": ("_deserialize_reference", NONE_RECORD_HOOK),
+    "object-list": ("_deserialize_object_list", NONE_LINK),
+}
+
+
+@functools.lru_cache(maxsize=None)  # same names are used by many tables (name, zone_name, ...)
 def _var_name_to_ref(name):
-    ref = re.sub(not_python_var_pattern, "_", name.lower())
-    return re.sub(multiple_underscores_pattern, "_", ref)
+    ref = not_python_var_pattern.sub("_", name.lower())
+    return multiple_underscores_pattern.sub("_", ref)
 
 
 class FieldDescriptor:
@@ -123,97 +139,152 @@ class FieldDescriptor:
 
         # -- prepare if string
         if isinstance(value, str):
-            # change multiple spaces to mono spaces
-            value = re.sub(spaces_and_newlines_pattern, lambda x: " ", value.strip())
+            value = self._prepare_str(value, index, check_length)
 
             # see if still not empty
-            if value == "":
+            if value is None:
                 return None
 
-            # make ASCII compatible
-            value = unidecode.unidecode(value)  # todo: is this still useful ?
-
-            # make lower case if not retaincase
-            if "retaincase" not in self.tags:
-                value = value.lower()
-
-            # check not too big
-            if check_length and (len(value) >= MAX_FIELD_LENGTH):
-                raise FieldValidationError(
-                    f"Field has more than {MAX_FIELD_LENGTH} characters which is the limit. "
-                    f"{self.get_error_location_message(value, index=index)}"
-                )
-
         # transform to external file if relevant
         if self.is_file_name:
             value = ExternalFile.deserialize(value)
 
         # -- deserialize
+        typed_deserializer_name, none_value = _TYPED_DESERIALIZERS.get(self.detailed_type, (None, None))
+        if typed_deserializer_name is None:
+            raise RuntimeError("should not be here")
 
-        # numeric types
-        if self.detailed_type in ("integer", "real"):
-            # manage none
-            if value is None:
-                return None
+        # manage none
+        if value is None:
+            return none_value
 
-            # special values: auto-calculate, auto-size, use-weather-file
-            if value in ("autocalculate", "autosize", "useweatherfile"):
-                return value
-
-            if self.detailed_type == "integer":
-                try:
-                    try:
-                        return int(value)
-                    except ValueError:
-                        i = float(value)
-                        if not i.is_integer():
-                            raise ValueError
-                        return int(i)
-                except Exception:
-                    raise FieldValidationError(
-                        f"Couldn't parse to integer. {self.get_error_location_message(value, index=index)}"
-                    )
+        return getattr(self, typed_deserializer_name)(value, index)
 
-            try:
-                return float(value)
-            except Exception:
-                raise FieldValidationError(
-                    f"Couldn't parse to float. {self.get_error_location_message(value, index=index)}"
-                )
-
-        # simple string types
-        if self.detailed_type in ("alpha", "choice", "node", "external-list"):
-            # manage none
-            if value is None:
+    def _dev_get_converter(self, check_length, trusted=False):
+        # Compiled equivalent of deserialize, used for bulk loading (see TableDescriptor._dev_get_field_converters).
+        # Empty values are always converted to None (and not to NONE_LINK, NONE_RECORD_HOOK or NONE_EXTERNAL_FILE).
+        # Tags and detailed type are resolved once, strings are fully converted inline, other values (records,
+        # external files, numbers) and file names use deserialize.
+        # Trusted data was written by opyplus: strings are already normalized (mono spaces, ASCII, lower case if not
+        # retaincase, length checked), only empty values and types are managed.
+        deserialize = self.deserialize
+
+        def fallback(value, index):
+            value = deserialize(value, index, check_length=check_length and not trusted)
+            return None if value in _EMPTY_VALUES else value
+
+        typed_deserializer_name, _ = _TYPED_DESERIALIZERS.get(self.detailed_type, (None, None))
+        if typed_deserializer_name is None or self.is_file_name:
+            return fallback
+
+        typed_deserialize = getattr(self, typed_deserializer_name)
+
+        if trusted:
+            if typed_deserializer_name == "_deserialize_string":
+                return lambda value, index: value if value else None
+
+            def convert_trusted(value, index):
+                if value is None or value == "":
+                    return None
+                return typed_deserialize(value, index)
+
+            return convert_trusted
+
+        lower = "retaincase" not in self.tags
+
+        def convert(value, index):
+            if value.__class__ is not str:
+                return None if value is None else fallback(value, index)
+
+            # same as _prepare_str
+            value = " ".join(value.split())
+            if value == "":
                 return None
+            if not value.isascii():
+                value = unidecode.unidecode(value)
+            if lower:
+                value = value.lower()
+            if check_length and (len(value) >= MAX_FIELD_LENGTH):
+                return fallback(value, index)  # raises
 
-            # ensure it was str
-            if not isinstance_str(value):
-                raise FieldValidationError(
-                    f"Value must be a string. {self.get_error_location_message(value, index=index)}"
-                )
-            return value
+            return typed_deserialize(value, index)
 
-        # manage hooks (eplus reference)
-        if self.detailed_type == "reference":
-            # manage None
-            if value is None:
-                return NONE_RECORD_HOOK
+        return convert
 
-            # reference class name appears in v9.0.1
-            references = self.tags.get("reference", [])
-            # table_name, index, value, references, class_references
-            return RecordHook(references, index, value)
+    def _prepare_str(self, value, index, check_length):
+        # change multiple spaces and new lines to mono spaces (str.split uses the same white spaces as regex \s)
+        value = " ".join(value.split())
 
-        # manage links (eplus object-list)
-        if self.detailed_type == "object-list":
-            # manage None
-            if value is None:
-                return NONE_LINK
+        # see if still not empty
+        if value == "":
+            return None
+
+        # make ASCII compatible (unidecode is slow, ASCII strings are left unchanged)
+        if not value.isascii():
+            value = unidecode.unidecode(value)  # todo: is this still useful ?
+
+        # make lower case if not retaincase
+        if "retaincase" not in self.tags:
+            value = value.lower()
+
+        # check not too big
+        if check_length and (len(value) >= MAX_FIELD_LENGTH):
+            raise FieldValidationError(
+                f"Field has more than {MAX_FIELD_LENGTH} characters which is the limit. "
+                f"{self.get_error_location_message(value, index=index)}"
+            )
 
-            return Link(self.tags["object-list"], value, index)
+        return value
 
-        raise RuntimeError("should not be here")
+    # typed deserializers (value is not None)
+    def _deserialize_integer(self, value, index):
+        # special values: auto-calculate, auto-size, use-weather-file
+        if value in ("autocalculate", "autosize", "useweatherfile"):
+            return value
+
+        try:
+            try:
+                return int(value)
+            except ValueError:
+                i = float(value)
+                if not i.is_integer():
+                    raise ValueError
+                return int(i)
+        except Exception:
+            raise FieldValidationError(
+                f"Couldn't parse to integer. {self.get_error_location_message(value, index=index)}"
+            )
+
+    def _deserialize_real(self, value, index):
+        # special values: auto-calculate, auto-size, use-weather-file
+        if value in ("autocalculate", "autosize", "useweatherfile"):
+            return value
+
+        try:
+            return float(value)
+        except Exception:
+            raise FieldValidationError(
+                f"Couldn't parse to float. {self.get_error_location_message(value, index=index)}"
+            )
+
+    def _deserialize_string(self, value, index):
+        # ensure it was str
+        if not isinstance_str(value):
+            raise FieldValidationError(
+                f"Value must be a string. {self.get_error_location_message(value, index=index)}"
+            )
+        return value
+
+    def _deserialize_reference(self, value, index):
+        # manage hooks (eplus reference)
+        # reference class name appears in v9.0.1
+        references = self.tags.get("reference", [])
+        # table_name, index, value, references, class_references
+        return RecordHook(references, index, value)
+
+    def _deserialize_object_list(self, value, index):
+        # manage links (eplus object-list)
+        return Link(self.tags["object-list"], value, index)
 
     # get info
     @property
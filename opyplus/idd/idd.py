@@ -11,9 +11,17 @@ field descriptor: descriptor of a field of a record
 pointing records (has tag 'object-list'): object that points towards another object
 pointed record (has tag 'reference'): object being pointed by another object
 """
+import os
 import re
+import sys
+import collections
+import gc
+import pickle
+import hashlib
 import logging
+import tempfile
 
+from ..version import version as opyplus_version
 from ..conf import CONF
 from ..util import to_buffer, version_str_to_version
 from .idd_debug import correct_idd
@@ -25,6 +33,42 @@ logger = logging.getLogger(__name__)
 
 _IDD_CACHE = {}  # {(major, minor): idd,... stores standard idds to prevent from parsing them each time
 
+# must be incremented when pickled idd layout changes in a way source hash doesn't catch
+_DISK_CACHE_FORMAT = 1
+_SOURCES_HASHES = {}  # {module name: sha256 of parsing and descriptors modules sources,...
+
+# idd line patterns (used with match, lines are already classified using their first character)
+_group_pattern = re.compile(r"^\\\s?group (.+)$")  # some groups have a space between \ and group (\s?)
+_tag_ref_and_value_pattern = re.compile(r"^([\w\-\>\<:]+) (.*)$")
+_named_field_pattern = re.compile(r"^\s*([AN])\d+\s*([;,])\s*\\[fF]ield (.*)$")
+_unnamed_fields_pattern = re.compile(r"^\s*([AN]\d+[;,]\s*)+.*$")
+_table_descriptor_pattern = re.compile(r"^\s*([\w:\-]+),\s*$")
+
+
+def _get_sources_hash(idd_module_name):
+    # opyplus version doesn't change during development, so code that builds pickled objects is hashed
+    if idd_module_name not in _SOURCES_HASHES:
+        sources_hash = hashlib.sha256()
+        for module_name in (__name__, f"{__package__}.idd_debug", f"{__package__}.table_descriptor",
+                            f"{__package__}.field_descriptor", idd_module_name):
+            with open(sys.modules[module_name].__file__, "rb") as f:
+                sources_hash.update(f.read())
+        _SOURCES_HASHES[idd_module_name] = sources_hash.hexdigest()
+    return _SOURCES_HASHES[idd_module_name]
+
+
+def _get_disk_cache_key(idd_cls, idd_path):
+    # cache must be rebuilt if idd file, cache format, opyplus version or code, or idd class changes
+    with open(idd_path, "rb") as f:
+        idd_hash = hashlib.sha256(f.read()).hexdigest()
+    return (
+        _DISK_CACHE_FORMAT,
+        opyplus_version,
+        _get_sources_hash(idd_cls.__module__),
+        f"{idd_cls.__module__}.{idd_cls.__qualname__}",
+        idd_hash
+    )
+
 
 class Idd:
     """
@@ -71,14 +115,72 @@ class Idd:
         for table_ref, table_descriptor in self.table_descriptors.items():
             table_descriptor.prepare_extensible()
 
+        # prepare indexes used by epgms (epgm tables are created lazily, so these indexes can't be built by tables)
+        self._dev_sorted_table_descriptors = collections.OrderedDict(sorted(self.table_descriptors.items()))
+        self._dev_table_hooks = {}  # {(hook_ref, table_lower_name): table_lower_ref, ...}
+        for table_lower_ref, table_descriptor in self._dev_sorted_table_descriptors.items():
+            table_hooks_references = table_descriptor.field_descriptors[0].tags.get("reference-class-name", ())
+            for ref in table_hooks_references:
+                self._dev_table_hooks[(ref, table_descriptor.table_name.lower())] = table_lower_ref
+
     @classmethod
     def _dev_get_from_cache(cls, version):
         major, minor, patch = version
         if (major, minor) not in _IDD_CACHE:
-            idd = cls(version_or_buffer_or_path=version)
+            idd = cls._dev_get_from_disk_cache(get_idd_path(version))
             _IDD_CACHE[(major, minor)] = idd
         return _IDD_CACHE[(major, minor)]
 
+    @classmethod
+    def _dev_get_from_disk_cache(cls, idd_path):
+        # leave if disk cache is disabled
+        if CONF.idd_cache_dir_path is None:
+            return cls(version_or_buffer_or_path=idd_path)
+
+        # prepare cache path (one file per idd class and idd file, key is stored in file header)
+        cache_key = _get_disk_cache_key(cls, idd_path)
+        cache_path = os.path.join(
+            CONF.idd_cache_dir_path,
+            f"{cls.__qualname__}-{os.path.splitext(os.path.basename(idd_path))[0]}.pickle"
+        )
+
+        # load if cache exists and is up to date
+        if os.path.isfile(cache_path):
+            # idd is made of many small objects, garbage collector slows down loading a lot
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                with open(cache_path, "rb") as f:
+                    if pickle.load(f) == cache_key:
+                        idd = pickle.load(f)
+                        idd.path = idd_path
+                        return idd
+            except Exception as e:
+                logger.warning(f"could not read idd disk cache, it will be rebuilt ({cache_path}): {e}")
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+
+        # parse
+        idd = cls(version_or_buffer_or_path=idd_path)
+
+        # write cache (in a temporary file first: other processes may be reading the cache)
+        try:
+            os.makedirs(CONF.idd_cache_dir_path, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=CONF.idd_cache_dir_path, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(cache_key, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    pickle.dump(idd, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temp_path, cache_path)
+            except BaseException:
+                os.remove(temp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"could not write idd disk cache ({cache_path}): {e}")
+
+        return idd
+
     def _parse(self, open_buffer):
         # variables
         group_name, rd, field_descriptor = None, None, None
@@ -94,71 +196,84 @@ class Idd:
         if len(row_l) == 2:  # this row appeared in idd >= 8.2.0
             _, self.build = row.split("IDD_BUILD ")
 
+        # prepare patterns match methods (called on most lines)
+        group_match = _group_pattern.match
+        tag_ref_and_value_match = _tag_ref_and_value_pattern.match
+        named_field_match = _named_field_pattern.match
+        unnamed_fields_match = _unnamed_fields_pattern.match
+        table_descriptor_match = _table_descriptor_pattern.match
+
         # iter
         for i, raw_line in enumerate(open_buffer):
-            line = raw_line.split("!")[0]  # we tear comment
+            line = raw_line.split("!", 1)[0]  # we tear comment
 
             # blank line
-            if re.search(r"^\s*$", line) is not None:
+            stripped_line = line.lstrip()
+            if stripped_line == "":
                 continue
 
-            # group comment (must be before comments)
-            match = re.search(r"^\\\s?group (.+)$", line)  # some groups have a space between \ and group (\s?)
-            if match is not None:
-                group_name = match.group(1).strip()
-                # self._groups_d[group_name.lower()] = dict(name=group_name, record_descriptors=[])
-
-                # re-initialize
-                rd, field_descriptor = None, None
-                continue
-
-            # tag
-            match = re.search(r"^\s*\\(.+)$", line)
-            if match is not None:
-                # identify
-                content = match.group(1)
-                if " " not in content:  # only a ref
-                    tag_ref = content.strip()
-                    tag_value = None
-                else:  # ref and value
-                    match = re.search(r"^([\w\-\>\<:]+) (.*)$", content)
-                    tag_ref = match.group(1)
-                    tag_value = match.group(2).strip()
-
-                # store
-                if field_descriptor is None:  # we are not in a field -> record descriptor comment
-                    rd.add_tag(tag_ref, tag_value)
-                else:  # we are in a field
-                    field_descriptor.append_tag(tag_ref, tag_value)
-                continue
-
-            # named field descriptor
-            match = re.search(r"^\s*([AN])\d+\s*([;,])\s*\\[fF]ield (.*)$", line)
-            if match is not None:
-                # identify
-                fieldd_type = match.group(1)
-                name = match.group(3).strip()
-                if name == "":
-                    name = None
-
-                # store
-                field_descriptor = rd.add_field_descriptor(fieldd_type, name=name)
-                continue
-
-            # unnamed field descriptors
-            match = re.search(r"^\s*([AN]\d+[;,]\s*)+.*$", line)
-            if match is not None:
-                # identify
-                fields_l = [s.strip() for s in match.group(1).strip()[:-1].split(",")]
-                for fieldd_s in fields_l:
-                    fieldd_type = fieldd_s[0]
+            # lines are classified using their first character, so each line is only matched against relevant
+            # patterns
+            first_char = stripped_line[0]
+
+            if first_char == "\\":
+                # group comment (must be before tags)
+                match = group_match(line)
+                if match is not None:
+                    group_name = match.group(1).strip()
+
+                    # re-initialize
+                    rd, field_descriptor = None, None
+                    continue
+
+                # tag
+                content = stripped_line[1:]
+                if content[-1:] == "\n":
+                    content = content[:-1]
+                if content != "":
+                    # identify
+                    if " " not in content:  # only a ref
+                        tag_ref = content.strip()
+                        tag_value = None
+                    else:  # ref and value
+                        tag_ref, tag_value = tag_ref_and_value_match(content).groups()
+                        tag_value = tag_value.strip()
 
                     # store
-                    field_descriptor = rd.add_field_descriptor(fieldd_type)
-                continue
+                    if field_descriptor is None:  # we are not in a field -> record descriptor comment
+                        rd.add_tag(tag_ref, tag_value)
+                    else:  # we are in a field
+                        field_descriptor.append_tag(tag_ref, tag_value)
+                    continue
+
+            elif first_char in ("A", "N"):
+                # named field descriptor
+                match = named_field_match(line)
+                if match is not None:
+                    # identify
+                    fieldd_type = match.group(1)
+                    name = match.group(3).strip()
+                    if name == "":
+                        name = None
 
-            # rd: record descriptor
-            match = re.search(r"^\s*([\w:\-]+),\s*$", line)
+                    # store
+                    field_descriptor = rd.add_field_descriptor(fieldd_type, name=name)
+                    continue
+
+                # unnamed field descriptors
+                match = unnamed_fields_match(line)
+                if match is not None:
+                    # identify
+                    fields_l = [s.strip() for s in match.group(1).strip()[:-1].split(",")]
+                    for fieldd_s in fields_l:
+                        fieldd_type = fieldd_s[0]
+
+                        # store
+                        field_descriptor = rd.add_field_descriptor(fieldd_type)
+                    continue
+
+            # rd: record descriptor (table names may start with A or N)
+            match = table_descriptor_match(line)
             if match is not None:
                 # identify
                 table_name = match.group(1).strip()
@@ -170,14 +285,14 @@ class Idd:
                 if rd.table_ref in self.table_descriptors:
                     raise RuntimeError("record descriptor already registered")
                 self.table_descriptors[rd.table_ref.lower()] = rd
-                # self._groups_d[group_name.lower()]["record_descriptors"].append(rd)
 
                 # re-initialize
                 field_descriptor = None
                 continue
 
             # skip special tables
-            if ("lead input;" in line.lower()) or ("simulation data;" in line.lower()):
+            lower_line = line.lower()
+            if ("lead input;" in lower_line) or ("simulation data;" in lower_line):
                 # re-initialize
                 rd, field_descriptor = None, None
                 continue
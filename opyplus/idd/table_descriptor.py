@@ -1,4 +1,5 @@
 """Idd table descriptor module."""
+import collections
 import logging
 import re
 
@@ -7,6 +8,8 @@ from .util import table_name_to_ref, get_field_attribute_extended_value
 
 logger = logging.getLogger(__name__)
 
+_EXTENSIBLE_FIELD_INDEXES_CACHE_SIZE = 1024  # resolved extensible refs kept by each table descriptor (lru)
+
 
 class TableDescriptor:
     """
@@ -36,6 +39,28 @@ class TableDescriptor:
         # (cycle_start, cycle_len, patterns) where patterns is (var_a_(\d+)_ref, var_b_(\d+)_ref, ...)
         self.extensible_info = None
 
+        # field indexes (built on first use, once idd has been fully prepared)
+        self._base_field_indexes = None  # {ref: index, ...}
+        self._extensible_field_patterns = None  # (compiled_pattern, ...)
+        self._extensible_field_indexes = collections.OrderedDict()  # {ref: index, ...} lru cache of extensible refs
+
+        # bulk loading (built on first use, see _dev_get_field_converters and _dev_get_required_indexes)
+        # {check_length or 'trusted': (converter, ...), ...}, not pickled (converters are closures)
+        self._field_converters = {}
+        self._required_indexes = None  # (base required indexes, extensible required reduced indexes)
+
+    def __getstate__(self):
+        """
+        Get state for pickling (idd cache), without field converters.
+
+        Returns
+        -------
+        dict
+        """
+        state = self.__dict__.copy()
+        state["_field_converters"] = {}
+        return state
+
     @property
     def field_descriptors(self):
         """
@@ -137,6 +162,7 @@ class TableDescriptor:
 
         # store cycle info
         self.extensible_info = (cycle_start, cycle_len, tuple(cycle_patterns))
+        self._base_field_indexes = None  # field indexes must be rebuilt
 
         # set field descriptor cycle_start index (for error messages while serialization)
         for i, fd in enumerate(self._field_descriptors[cycle_start:]):
@@ -169,20 +195,25 @@ class TableDescriptor:
         -------
         int
         """
+        # prepare indexes if first call
+        if self._base_field_indexes is None:
+            self._prepare_field_indexes()
+
         # general case
-        for pattern_num in range(self.base_fields_nb):
-            field_descriptor = self._field_descriptors[pattern_num]
-            if field_descriptor.ref is None:  # can happen
-                continue
-            if field_descriptor.ref == ref:
-                return pattern_num
+        index = self._base_field_indexes.get(ref)
+        if index is not None:
+            return index
 
         # extensible
-        ext_info = self.extensible_info
-        if ext_info is not None:
-            cycle_start, cycle_len, patterns = ext_info
-            for pattern_num, pat in enumerate(patterns):
-                match = re.fullmatch(pat, ref)
+        extensible_field_indexes = self._extensible_field_indexes
+        index = extensible_field_indexes.get(ref)
+        if index is not None:
+            extensible_field_indexes.move_to_end(ref)
+            return index
+        if self.extensible_info is not None:
+            cycle_start, cycle_len, _ = self.extensible_info
+            for pattern_num, pattern in enumerate(self._extensible_field_patterns):
+                match = pattern.fullmatch(ref)
                 if match is None:  # not found
                     continue
 
@@ -193,13 +224,52 @@ class TableDescriptor:
                 if cycle_num <= 0:
                     continue
 
-                # calculate and return index
-                return cycle_start + (cycle_num - 1) * cycle_len + pattern_num
+                # calculate, store and return index
+                index = cycle_start + (cycle_num - 1) * cycle_len + pattern_num
+                extensible_field_indexes[ref] = index
+                if len(extensible_field_indexes) > _EXTENSIBLE_FIELD_INDEXES_CACHE_SIZE:
+                    extensible_field_indexes.popitem(last=False)  # least recently used
+                return index
 
         err_msg = f"No field of '{self.table_name}' has ref '{ref}'.\nAvailable fields: \n - "
         err_msg += "\n - ".join(fd.ref for fd in self._field_descriptors if fd.ref is not None)
         raise AttributeError(err_msg)
 
+    def _prepare_field_indexes(self):
+        # base fields (first field wins if a ref is used twice)
+        base_field_indexes = {}
+        for index in range(self.base_fields_nb):
+            ref = self._field_descriptors[index].ref
+            if ref is not None and ref not in base_field_indexes:  # ref can be None
+                base_field_indexes[ref] = index
+
+        # extensible fields
+        self._extensible_field_patterns = () if self.extensible_info is None else tuple(
+            re.compile(pattern) for pattern in self.extensible_info[2])
+        self._extensible_field_indexes = collections.OrderedDict()
+
+        self._base_field_indexes = base_field_indexes
+
+    def _dev_get_field_converters(self, check_length, trusted=False):
+        # Field converters by reduced index, see FieldDescriptor._dev_get_converter. Used by records bulk loading.
+        key = "trusted" if trusted else check_length
+        converters = self._field_converters.get(key)
+        if converters is None:
+            converters = tuple(fd._dev_get_converter(check_length, trusted=trusted) for fd in self._field_descriptors)
+            self._field_converters[key] = converters
+        return converters
+
+    def _dev_get_required_indexes(self):
+        # (base required field indexes, extensible required field reduced indexes)
+        if self._required_indexes is None:
+            base_fields_nb = self.base_fields_nb
+            required_indexes = [i for i, fd in enumerate(self._field_descriptors) if fd.is_required]
+            self._required_indexes = (
+                tuple(i for i in required_indexes if i < base_fields_nb),
+                tuple(i for i in required_indexes if i >= base_fields_nb)
+            )
+        return self._required_indexes
+
     def get_field_reduced_index(self, index):
         """
         Get field reduced index.
@@ -11,7 +11,7 @@ from ..compatibility import SIMULATION_INPUT_COMMAND_STYLES, SIMULATION_COMMAND_
     get_simulated_epw_path, get_simulation_base_command, get_simulation_input_command_style, \
     get_simulation_command_style, get_eplus_base_dir_path
 
-from opyplus.standard_output.standard_output import StandardOutput
+from opyplus.standard_output.standard_output import StandardOutput, CACHE_METADATA_FILE_NAME
 from opyplus.mtd import Mtd
 from opyplus.eio import Eio
 from opyplus.err import Err
@@ -410,7 +410,7 @@ class Simulation:
         return Err(self.get_resource_path(ResourcesRefs.err, raise_if_not_found=True))
 
     @check_status(FINISHED)
-    def get_out_eso(self, print_function=lambda x: None):
+    def get_out_eso(self, print_function=lambda x: None, use_cache=False):
         """
         Get simulation output eso.
 
@@ -418,15 +418,38 @@ class Simulation:
         ----------
         print_function: typing.Callable
             print function, default does not do anything
+        use_cache: bool
+            if True, parsed eso is cached next to the eso file (eso_path + '.cache', see StandardOutput.to_cache),
+            and cache is reused while it is newer than the eso file. Default is False. Cache errors are only logged
+            (parsed eso is returned even if cache could not be written).
 
         Returns
         -------
         StandardOutput
         """
-        return StandardOutput(
-            self.get_resource_path(ResourcesRefs.eso, raise_if_not_found=True),
-            print_function=print_function
-        )
+        eso_path = self.get_resource_path(ResourcesRefs.eso, raise_if_not_found=True)
+        if not use_cache:
+            return StandardOutput(eso_path, print_function=print_function)
+
+        # load cache if up to date
+        cache_path = eso_path + ".cache"
+        cache_metadata_path = os.path.join(cache_path, CACHE_METADATA_FILE_NAME)
+        if (
+                os.path.isfile(cache_metadata_path) and
+                os.stat(cache_metadata_path).st_mtime_ns >= os.stat(eso_path).st_mtime_ns
+        ):
+            try:
+                return StandardOutput.from_cache(cache_path)
+            except Exception as e:
+                logger.warning(f"could not read eso cache, it will be rebuilt ({cache_path}): {e}")
+
+        # parse and write cache
+        eso = StandardOutput(eso_path, print_function=print_function)
+        try:
+            eso.to_cache(cache_path)
+        except Exception as e:  # cache is optional, any error (parquet engine, disk...) must not lose parsed eso
+            logger.warning(f"could not write eso cache ({cache_path}): {e}")
+        return eso
 
     @check_status(FINISHED)
     def get_out_eio(self):
@@ -1,9 +1,10 @@
 """Data container module."""
-import datetime as dt
 
 import pandas as pd
 from pandas.testing import assert_index_equal
 
+from ..util import check_datetime_column_range
+
 
 class DataContainer:
     """
@@ -140,10 +141,9 @@ class DataContainer:
                 self.df[col] = default
 
         # create and set index
-        self.df.index = self.df.apply(
-            lambda x: dt.datetime(*(int(x[k]) for k in ("year", "month", "day", "hour", "minute"))),
-            axis=1
-        )
+        check_datetime_column_range(self.df["hour"], "hour", 0, 23)
+        check_datetime_column_range(self.df["minute"], "minute", 0, 59)
+        self.df.index = pd.DatetimeIndex(pd.to_datetime(self.df[["year", "month", "day", "hour", "minute"]]))
 
         # force freq (if relevant)
         old_index = self.df.index
@@ -0,0 +1,163 @@
+"""Byte offsets index of eso files, used to parse environments on demand."""
+import json
+import logging
+import mmap
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".index.json"
+
+
+def get_eso_index_path(eso_path):
+    """
+    Get path of the index sidecar file of an eso file.
+
+    Parameters
+    ----------
+    eso_path: str
+
+    Returns
+    -------
+    str
+    """
+    return eso_path + INDEX_SUFFIX
+
+
+def build_eso_index(eso_path, encoding):
+    """
+    Build the byte offsets index of an eso file.
+
+    Parameters
+    ----------
+    eso_path: str
+    encoding: str
+        used to decode environment titles
+
+    Returns
+    -------
+    dict
+        {
+            "version": int,
+            "eso_size": int,
+            "eso_mtime_ns": int,
+            "data_start": int,  # offset of first line after data dictionary
+            "data_end": int,  # offset of 'End of Data' line
+            "environments": [[title, start, end], ...]  # environment title (lower case) and data offsets
+        }
+    """
+    stat = os.stat(eso_path)
+    if stat.st_size == 0:
+        raise RuntimeError(f"eso file is empty: {eso_path}")
+
+    with open(eso_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # data dictionary
+        data_dictionary_end = mm.find(b"\nEnd of Data Dictionary")
+        if data_dictionary_end == -1:
+            raise RuntimeError(f"eso file has no 'End of Data Dictionary' line: {eso_path}")
+        data_start = mm.find(b"\n", data_dictionary_end + 1) + 1
+        if data_start == 0:
+            raise RuntimeError(f"eso file has no 'End of Data' line: {eso_path}")
+
+        # data end
+        data_end = mm.find(b"\nEnd of Data", data_start - 1) + 1
+        if data_end == 0:
+            raise RuntimeError(f"eso file has no 'End of Data' line: {eso_path}")
+
+        # environments (code 1 lines)
+        environments = []
+        position = data_start - 1
+        while True:
+            position = mm.find(b"\n1,", position, data_end)
+            if position == -1:
+                break
+            line_end = mm.find(b"\n", position + 1)
+            title = mm[position + 3:line_end].decode(encoding, errors="ignore").split(",")[0].lower()
+            if len(environments) > 0:
+                environments[-1][2] = position + 1
+            environments.append([title, position + 1, data_end])
+            position = line_end
+
+    return dict(
+        version=INDEX_VERSION,
+        eso_size=stat.st_size,
+        eso_mtime_ns=stat.st_mtime_ns,
+        data_start=data_start,
+        data_end=data_end,
+        environments=environments
+    )
+
+
+def get_eso_index(eso_path, encoding):
+    """
+    Get the byte offsets index of an eso file.
+
+    Index is read from its sidecar file if it exists and is up to date, else it is built and written to the sidecar
+    file (a warning is logged if writing fails, for example in a read-only directory).
+
+    Parameters
+    ----------
+    eso_path: str
+    encoding: str
+
+    Returns
+    -------
+    dict
+        see build_eso_index
+    """
+    index_path = get_eso_index_path(eso_path)
+    stat = os.stat(eso_path)
+
+    # load if index exists and is up to date
+    if os.path.isfile(index_path):
+        try:
+            with open(index_path) as f:
+                index = json.load(f)
+            if (
+                    (index["version"], index["eso_size"], index["eso_mtime_ns"]) ==
+                    (INDEX_VERSION, stat.st_size, stat.st_mtime_ns)
+            ):
+                return index
+        except Exception as e:
+            logger.warning(f"could not read eso index, it will be rebuilt ({index_path}): {e}")
+
+    # build
+    index = build_eso_index(eso_path, encoding)
+
+    # write (in a temporary file first: other processes may be reading the index)
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(index_path)), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(index, f)
+            os.replace(temp_path, index_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+    except OSError as e:
+        logger.warning(f"could not write eso index ({index_path}): {e}")
+
+    return index
+
+
+def read_eso_segment(eso_path, start, end, encoding):
+    """
+    Read part of an eso file, given its byte offsets.
+
+    Parameters
+    ----------
+    eso_path: str
+    start: int
+    end: int
+    encoding: str
+
+    Returns
+    -------
+    str
+    """
+    with open(eso_path, "rb") as f:
+        f.seek(start)
+        content = f.read(end - start)
+    return content.decode(encoding, errors="ignore")
@@ -0,0 +1,102 @@
+"""Binary columnar storage of standard output data frames (used by StandardOutput cache)."""
+import importlib.util
+import os
+
+import numpy as np
+import pandas as pd
+
+# storages
+PARQUET = "parquet"
+NPY = "npy"
+STORAGES = (PARQUET, NPY)
+
+
+def get_default_storage():
+    """
+    Get default storage: parquet if a parquet engine (pyarrow or fastparquet) is installed, else npy.
+
+    Returns
+    -------
+    str
+    """
+    for engine in ("pyarrow", "fastparquet"):
+        if importlib.util.find_spec(engine) is not None:
+            return PARQUET
+    return NPY
+
+
+def write_frame(df, path, storage):
+    """
+    Write a data frame.
+
+    Parameters
+    ----------
+    df: pandas.DataFrame
+        columns must be strings, object columns must only contain strings (for npy storage)
+    path: str
+        path without extension (npy storage writes a directory)
+    storage: {'parquet', 'npy'}
+
+    Returns
+    -------
+    dict
+        frame info (json serializable), needed to read frame
+    """
+    info = dict(
+        columns=list(df.columns),
+        datetime_index=isinstance(df.index, pd.DatetimeIndex),
+        index_freq=None
+    )
+    if info["datetime_index"] and df.index.freq is not None:
+        info["index_freq"] = df.index.freqstr
+
+    if storage == PARQUET:
+        df.to_parquet(f"{path}.parquet")
+        return info
+
+    # npy: one 2d array per dtype
+    os.mkdir(path)
+    np.save(os.path.join(path, "index.npy"), df.index.to_numpy())
+    columns_by_dtype = dict()
+    for column, dtype in df.dtypes.items():
+        columns_by_dtype.setdefault(dtype, []).append(column)
+    info["blocks"] = []
+    for i, (dtype, columns) in enumerate(columns_by_dtype.items()):
+        values = df[columns].to_numpy()
+        if values.dtype == object:
+            values = values.astype(str)
+        np.save(os.path.join(path, f"{i}.npy"), values)
+        info["blocks"].append([str(dtype), columns])
+    return info
+
+
+def read_frame(path, info, storage):
+    """
+    Read a data frame.
+
+    Parameters
+    ----------
+    path: str
+        path without extension
+    info: dict
+        frame info, as returned by write_frame
+    storage: {'parquet', 'npy'}
+
+    Returns
+    -------
+    pandas.DataFrame
+    """
+    if storage == PARQUET:
+        df = pd.read_parquet(f"{path}.parquet")
+    else:
+        data = dict()
+        for i, (dtype, columns) in enumerate(info["blocks"]):
+            values = np.load(os.path.join(path, f"{i}.npy")).astype(dtype, copy=False)
+            for j, column in enumerate(columns):
+                data[column] = values[:, j]
+        df = pd.DataFrame(data, index=np.load(os.path.join(path, "index.npy")), columns=info["columns"])
+
+    # frequency is not stored with index
+    if info["datetime_index"]:
+        df.index = pd.DatetimeIndex(df.index, freq=info["index_freq"])
+    return df
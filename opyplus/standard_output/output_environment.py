@@ -114,15 +114,12 @@ class OutputEnvironment:
                 self._variables_code_to_freq[var.code] = freq
 
     def _dev_register_instant(self, simplified_frequency, *args):
-        if simplified_frequency == SUB_HOURLY:
-            # each call
-            for freq in (EACH_CALL, TIMESTEP, HOURLY):
-                try:
-                    self._data_containers_by_freq[freq].register_instant(*args)
-                except KeyError:
-                    pass
-            return
-        self._data_containers_by_freq[simplified_frequency].register_instant(*args)
+        # frequencies that have no container (no variable, or not loaded) are skipped
+        for freq in (EACH_CALL, TIMESTEP, HOURLY) if simplified_frequency == SUB_HOURLY else (simplified_frequency,):
+            try:
+                self._data_containers_by_freq[freq].register_instant(*args)
+            except KeyError:
+                pass
 
     def _dev_register_value(self, code, value):
         self._data_containers_by_freq[self._variables_code_to_freq[code]].register_value(code, value)
@@ -135,6 +132,13 @@ class OutputEnvironment:
         for freq, container in self._data_containers_by_freq.items():
             container.build_df()
 
+    def _dev_set_dfs(self, dfs_by_freq):
+        # used when dataframes are already built (cache)
+        for freq, df in dfs_by_freq.items():
+            container = self._data_containers_by_freq[freq]
+            container.df = df
+            container.values = None
+
     def _dev_get_data_conainers_by_freq(self):
         return self._data_containers_by_freq.copy()
 
@@ -1,19 +1,38 @@
 """Functions to parse EnergyPlus eso files."""
 import collections
+import io
 import re
 import time
 
-from .output_environment import OutputEnvironment, EACH_CALL, DAILY, MONTHLY, ANNUAL, RUN_PERIOD, SUB_HOURLY, \
-    FREQUENCIES
+import numpy as np
+import pandas as pd
+
+from .output_environment import OutputEnvironment, EACH_CALL, TIMESTEP, HOURLY, DAILY, MONTHLY, ANNUAL, RUN_PERIOD, \
+    SUB_HOURLY, FREQUENCIES
 from .output_variable import OutputVariable
 
 comment_brackets_pattern = re.compile(r"\s\[[\w,]+\]")
+# environment and instant lines of data, with their preceding line break (code 6 is a variable code for eplus < 8.9)
+instant_line_pattern = re.compile(r"\n([1-6]),([^\n]*)")
+instant_line_pattern_without_annual = re.compile(r"\n([1-5]),([^\n]*)")
 
 # other
 METER = "Meter"
 
+# parsing engines
+DEFAULT_ENGINE = "default"
+FAST_ENGINE = "fast"
+ENGINES = (DEFAULT_ENGINE, FAST_ENGINE)
+
 
-def parse_eso(file_like, print_function=lambda x: None):
+def parse_eso(
+        file_like,
+        print_function=lambda x: None,
+        engine=DEFAULT_ENGINE,
+        variables=None,
+        frequencies=None,
+        environments=None
+):
     """
     Parse an eso file.
 
@@ -22,11 +41,150 @@ def parse_eso(file_like, print_function=lambda x: None):
     file_like: typing.StringIO
     print_function: typing.Callable
         function used to print progress while parsing the eso. By default does nothing.
+    engine: {'default', 'fast'}
+        'default' parses data line by line, 'fast' reads all data at once with pandas and builds data frames with
+        numpy (faster for big files, but needs more memory while parsing).
+    variables: typing.Iterable[str] or None
+        if given, only these variables are loaded. Variables are given by ref ('key_value,name', for example
+        'environment,Site Outdoor Air Drybulb Temperature' or 'electricity:facility,Meter'), case insensitive.
+    frequencies: typing.Iterable[str] or None
+        if given, only variables of these frequencies are loaded (see FREQUENCIES).
+    environments: typing.Iterable[str] or None
+        if given, only these environments are loaded (environment titles, case insensitive).
+
+    Returns
+    -------
+    environments_by_title, variables_by_freq
 
     Notes
     -----
     start and end instants are given in eso. we only use start instant because we want to work in left convention
     """
+    annual_code, variables_by_freq, max_vars_num, row_num = parse_eso_data_dictionary(
+        file_like,
+        print_function=print_function,
+        variables=variables,
+        frequencies=frequencies
+    )
+    environments_by_title = parse_eso_data(
+        file_like,
+        annual_code,
+        variables_by_freq,
+        max_vars_num,
+        print_function=print_function,
+        engine=engine,
+        environments=environments,
+        row_num=row_num
+    )
+    return environments_by_title, variables_by_freq
+
+
+def parse_eso_data_dictionary(file_like, print_function=lambda x: None, variables=None, frequencies=None):
+    """
+    Parse the data dictionary of an eso file (file_like is left at the first data line).
+
+    Parameters
+    ----------
+    file_like: typing.StringIO
+    print_function: typing.Callable
+    variables: typing.Iterable[str] or None
+        see parse_eso
+    frequencies: typing.Iterable[str] or None
+        see parse_eso
+
+    Returns
+    -------
+    annual_code, variables_by_freq, max_vars_num, row_num
+    """
+    annual_code, variables_by_freq, max_vars_num, row_num = _parse_data_dictionary(file_like, print_function)
+
+    # filter variables
+    if variables is not None or frequencies is not None:
+        variables_by_freq = _filter_variables(variables_by_freq, variables, frequencies)
+
+    return annual_code, variables_by_freq, max_vars_num, row_num
+
+
+def parse_eso_data(
+        file_like,
+        annual_code,
+        variables_by_freq,
+        max_vars_num,
+        print_function=lambda x: None,
+        engine=DEFAULT_ENGINE,
+        environments=None,
+        row_num=0
+):
+    """
+    Parse eso data (after data dictionary), until 'End of Data' line.
+
+    Parameters
+    ----------
+    file_like: typing.StringIO
+    annual_code: str or None
+    variables_by_freq: typing.Dict[str, typing.List[opyplus.standard_output.output_variable.OutputVariable]]
+    max_vars_num: int
+        annual_code, variables_by_freq and max_vars_num are given by parse_eso_data_dictionary
+    print_function: typing.Callable
+    engine: {'default', 'fast'}
+    environments: typing.Iterable[str] or None
+    row_num: int
+        number of rows already read (only used for progress printing)
+
+    Returns
+    -------
+    environments_by_title
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"unknown engine: '{engine}', available engines: {ENGINES}")
+
+    # prepare environments filter
+    if environments is not None:
+        environments = {title.lower() for title in environments}
+
+    if engine == FAST_ENGINE:
+        return _parse_data_fast(
+            file_like,
+            annual_code,
+            variables_by_freq,
+            max_vars_num,
+            environments
+        )
+    return _parse_data(
+        file_like,
+        annual_code,
+        variables_by_freq,
+        row_num,
+        environments,
+        print_function
+    )
+
+
+def _filter_variables(variables_by_freq, variables, frequencies):
+    # check frequencies
+    if frequencies is not None:
+        frequencies = set(frequencies)
+        unknown_frequencies = frequencies.difference(FREQUENCIES)
+        if len(unknown_frequencies) > 0:
+            raise ValueError(f"unknown frequencies: {sorted(unknown_frequencies)}, available: {FREQUENCIES}")
+
+    # prepare variable refs
+    if variables is not None:
+        variables = {ref.lower() for ref in variables}
+
+    # filter (frequencies that have no variable left are removed)
+    filtered_variables_by_freq = collections.OrderedDict()
+    for freq, freq_variables in variables_by_freq.items():
+        if frequencies is not None and freq not in frequencies:
+            continue
+        if variables is not None:
+            freq_variables = [var for var in freq_variables if var.ref.lower() in variables]
+        if len(freq_variables) > 0:
+            filtered_variables_by_freq[freq] = freq_variables
+    return filtered_variables_by_freq
+
+
+def _parse_data_dictionary(file_like, print_function):
     # ----------------------- LOAD METERS
     # VERSION
     row_s = next(file_like)
@@ -51,6 +209,7 @@ def parse_eso(file_like, print_function=lambda x: None):
 
     # variables
     variables_by_freq = dict()  # timestep: variables
+    max_vars_num = 1
 
     # initialize timer
     start = time.time()
@@ -75,6 +234,8 @@ def parse_eso(file_like, print_function=lambda x: None):
         if int(code) <= max_data_dict_info_code_int:
             continue
 
+        max_vars_num = max(max_vars_num, vars_num)
+
         # split content and comment
         content, comment = other.split("!", 1)
 
@@ -134,11 +295,15 @@ def parse_eso(file_like, print_function=lambda x: None):
         sorted(variables_by_freq, key=lambda freq: FREQUENCIES.index(freq))
     )
 
-    # ------------------------ LOAD DATA
+    return annual_code, variables_by_freq, max_vars_num, row_num
+
+
+def _parse_data(file_like, annual_code, variables_by_freq, row_num, environments, print_function):
     # global variables
     environments_by_title = collections.OrderedDict()  # {environment_title: environment: ,
+    variable_codes = {var.code for freq_variables in variables_by_freq.values() for var in freq_variables}
 
-    # current variables
+    # current variables (env is None if current environment is not loaded)
     env = None
 
     # loop
@@ -161,6 +326,11 @@ def parse_eso(file_like, print_function=lambda x: None):
         if code == "1":  # new environment
             other = other.split(",")
 
+            # skip if not requested
+            if environments is not None and other[0].lower() not in environments:
+                env = None
+                continue
+
             # create and store environment
             env = OutputEnvironment(
                 other[0].lower(),
@@ -175,6 +345,9 @@ def parse_eso(file_like, print_function=lambda x: None):
             # prepare and store environment data
             # data: { code: values, ...
 
+        elif env is None:  # environment is not loaded
+            continue
+
         elif code == "2":  # timestep (and hourly) data
             # 0-sim_day, 1-month_num, 2-day_num, 3-dst, 4-hour_num, 5-start_minute, 6-end_minute, 7-day_type
             other = other.split(",")
@@ -219,7 +392,7 @@ def parse_eso(file_like, print_function=lambda x: None):
         elif code == annual_code:  # will only be used for >= 9.0.1
             env._dev_register_instant(ANNUAL, int(other))
 
-        else:  # value to store
+        elif code in variable_codes:  # value to store (other variables are not loaded)
             # parse
             try:
                 val = float(other)
@@ -233,4 +406,151 @@ def parse_eso(file_like, print_function=lambda x: None):
     for env in environments_by_title.values():
         env._dev_build_dfs()
 
-    return environments_by_title, variables_by_freq
+    return environments_by_title
+
+
+def _parse_data_fast(file_like, annual_code, variables_by_freq, max_vars_num, environments):
+    # Instant lines (codes 1 to 6) are found with a regex and parsed in python (there are few of them). Value lines are
+    # parsed at once by pandas. Each value row is then dispatched to the last instant of its data container (found
+    # with numpy.searchsorted on instants positions).
+    content = file_like.read()
+    if content.startswith("End of Data"):
+        data_end = 0
+    else:
+        data_end = content.find("\nEnd of Data") + 1
+        if data_end == 0:
+            raise RuntimeError("eso file has no 'End of Data' line")
+    content = "\n" + content[:data_end]  # all lines start with a line break (makes regex search much faster)
+
+    # find instant lines, remove them from values content and store their position (number of value rows before them)
+    instants = []  # (code, position, other)
+    value_pieces = []
+    value_rows_nb = 0
+    piece_start = 1
+    pattern = instant_line_pattern_without_annual if annual_code is None else instant_line_pattern
+    for match in pattern.finditer(content):
+        piece = content[piece_start:match.start() + 1]
+        value_rows_nb += piece.count("\n")
+        value_pieces.append(piece)
+        instants.append((int(match.group(1)), value_rows_nb, match.group(2).strip()))
+        piece_start = match.end() + 1
+    value_pieces.append(content[piece_start:])
+    del content
+    values_content = "".join(value_pieces)
+    del value_pieces
+
+    # parse values (we don't parse min and max)
+    if values_content.strip() == "":
+        codes, values = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=float)
+    else:
+        values_df = pd.read_csv(
+            io.StringIO(values_content),
+            header=None,
+            names=range(max_vars_num + 1),
+            usecols=(0, 1),
+            dtype={0: np.int64, 1: float}
+        )
+        codes, values = values_df[0].to_numpy(), values_df[1].to_numpy()
+        del values_df
+    del values_content
+
+    # prepare variable columns by code, for each frequency
+    variable_columns_by_freq = dict()
+    for freq, variables in variables_by_freq.items():
+        variable_columns = np.full(max([int(v.code) for v in variables] + [codes.max(initial=0)]) + 1, -1)
+        variable_columns[[int(v.code) for v in variables]] = np.arange(len(variables))
+        variable_columns_by_freq[freq] = variable_columns
+
+    # instant codes, by frequency
+    instant_codes = {
+        EACH_CALL: 2,
+        TIMESTEP: 2,
+        HOURLY: 2,
+        DAILY: 3,
+        MONTHLY: 4,
+        ANNUAL: None if annual_code is None else int(annual_code),
+        RUN_PERIOD: 5
+    }
+
+    # group instants by environment
+    environments_instants = []
+    for code, position, other in instants:
+        if code == 1:
+            environments_instants.append((position, other, collections.defaultdict(list)))
+        else:
+            environments_instants[-1][2][code].append((position, other))
+
+    # create environments
+    environments_by_title = collections.OrderedDict()
+    for i, (env_start, env_other, env_instants) in enumerate(environments_instants):
+        env_end = environments_instants[i + 1][0] if i + 1 < len(environments_instants) else len(codes)
+        env_other = env_other.split(",")
+
+        # skip if not requested
+        if environments is not None and env_other[0].lower() not in environments:
+            continue
+        env = OutputEnvironment(
+            env_other[0].lower(),
+            float(env_other[1]),
+            float(env_other[2]),
+            float(env_other[3]),
+            float(env_other[4]),
+            variables_by_freq
+        )
+        environments_by_title[env.title] = env
+
+        # fill data containers
+        env_rows = np.arange(env_start, env_end)
+        env_codes = codes[env_start:env_end]
+        for freq, container in env._dev_get_data_conainers_by_freq().items():
+            # find instants (we leave container empty if no instant)
+            freq_instants = env_instants.get(instant_codes[freq], [])
+            if len(freq_instants) == 0:
+                continue
+
+            # instant columns
+            if freq in (EACH_CALL, TIMESTEP, HOURLY):
+                # 0-sim_day, 1-month_num, 2-day_num, 3-dst, 4-hour_num, 5-start_minute, 6-end_minute, 7-day_type
+                others = [other.split(",") for _, other in freq_instants]
+                instant_values = dict(
+                    month=[int(other[1]) for other in others],
+                    day=[int(other[2]) for other in others],
+                    hour=[int(other[4]) - 1 for other in others],
+                    minute=[int(float(other[5])) for other in others],
+                    end_minute=[int(float(other[6])) for other in others],
+                    dst=[int(other[3]) for other in others],
+                    day_type=[other[7] for other in others]
+                )
+            elif freq == DAILY:
+                # 0-sim_day, 1-month_num, 2-day_num, 3-dst, 4-day_type
+                others = [other.split(",") for _, other in freq_instants]
+                instant_values = dict(
+                    month=[int(other[1]) for other in others],
+                    day=[int(other[2]) for other in others],
+                    dst=[int(other[3]) for other in others],
+                    day_type=[other[4] for other in others]
+                )
+            elif freq == MONTHLY:
+                instant_values = dict(month=[int(other.split(",")[1]) for _, other in freq_instants])
+            elif freq == ANNUAL:
+                instant_values = dict(year=[int(other) for _, other in freq_instants])
+            else:
+                instant_values = dict()
+
+            # find value rows and their instant (if a variable appears more than once for the same instant, last value
+            # is kept)
+            variable_columns = variable_columns_by_freq[freq][env_codes]
+            instant_nums = np.searchsorted([position for position, _ in freq_instants], env_rows, side="right") - 1
+            value_rows = np.flatnonzero((variable_columns != -1) & (instant_nums >= 0))
+            freq_values = np.full((len(freq_instants), len(container.variables_by_code)), np.nan)
+            freq_values[instant_nums[value_rows], variable_columns[value_rows]] = values[env_start + value_rows]
+
+            # store
+            container.values = instant_values
+            for column, code in enumerate(container.variables_by_code):
+                container.values[code] = freq_values[:, column]
+
+        # build dataframes
+        env._dev_build_dfs()
+
+    return environments_by_title
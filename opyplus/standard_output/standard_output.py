@@ -1,16 +1,28 @@
 """Module to work with EnergyPlus standard output (eso file)."""
 
+import collections
+import io
+import json
 import logging
 import os
+import shutil
+import tempfile
 import textwrap
 
 from slugify import slugify
 
-from ..util import to_buffer
-from .parse_eso import parse_eso
+from ..util import to_buffer, detect_encoding
+from .parse_eso import parse_eso, parse_eso_data_dictionary, parse_eso_data, ENGINES
+from .eso_index import get_eso_index, read_eso_segment
+from .frame_cache import STORAGES, get_default_storage, write_frame, read_frame
+from .output_environment import OutputEnvironment
+from .output_variable import OutputVariable
 
 logger = logging.getLogger(__name__)
 
+CACHE_VERSION = 1
+CACHE_METADATA_FILE_NAME = "standard_output.json"
+
 
 class StandardOutput:
     """
@@ -21,6 +33,24 @@ class StandardOutput:
     buffer_or_path: typing.StringIO or str
     start_year: int or None
     print_function: typing.Callable
+    encoding: str or None
+        file encoding (only used if buffer_or_path is a path). If None (default), encoding is detected (see
+        CONF.encoding_detection).
+    engine: {'default', 'fast'}
+        eso parsing engine. 'fast' reads all data at once with pandas and numpy: it is much faster for big files, but
+        needs more memory while parsing.
+    variables: typing.Iterable[str] or None
+        if given, only these variables are loaded, by ref ('key_value,name', case insensitive). For example:
+        ['environment,Site Outdoor Air Drybulb Temperature', 'electricity:facility,Meter'].
+    frequencies: typing.Iterable[str] or None
+        if given, only variables of these frequencies are loaded ('each_call', 'timestep', 'hourly', 'daily',
+        'monthly', 'annual' or 'run_period').
+    environments: typing.Iterable[str] or None
+        if given, only these environments are loaded (titles, case insensitive).
+    lazy: bool
+        if True, only the data dictionary is parsed at initialization, and each environment is parsed on demand (for
+        example by get_data). buffer_or_path must be a path. Environments byte offsets are found by an index pass,
+        stored in a sidecar file next to the eso (eso_path + '.index.json'), and reused while the eso is unchanged.
 
     Notes
     -----
@@ -31,15 +61,100 @@ class StandardOutput:
     !! this is not the same convention as in weather data chapter !!
     """
 
-    def __init__(self, buffer_or_path, start_year=None, print_function=lambda x: None):
+    def __init__(
+            self,
+            buffer_or_path,
+            start_year=None,
+            print_function=lambda x: None,
+            encoding=None,
+            engine="default",
+            variables=None,
+            frequencies=None,
+            environments=None,
+            lazy=False
+    ):
         self._path = None
-        self._path, buffer = to_buffer(buffer_or_path)
         self._start_year = None
+        self._print_function = print_function
+        self._engine = engine
+        self._environments_offsets = {}  # {title: (start, end), ...} only for environments that are not parsed yet
+
+        if lazy:
+            self._init_lazy(buffer_or_path, encoding, variables, frequencies, environments)
+            if start_year is not None:
+                self.create_datetime_index(start_year)
+            return
+
+        self._path, buffer = to_buffer(buffer_or_path, encoding=encoding)
         with buffer as f:
-            self._environments_by_title, self._variables_by_freq = parse_eso(f, print_function=print_function)
+            self._environments_by_title, self._variables_by_freq = parse_eso(
+                f,
+                print_function=print_function,
+                engine=engine,
+                variables=variables,
+                frequencies=frequencies,
+                environments=environments
+            )
         if start_year is not None:
             self.create_datetime_index(start_year)
 
+    def _init_lazy(self, path, encoding, variables, frequencies, environments):
+        if not isinstance(path, str):
+            raise ValueError("lazy mode needs an eso path, not a buffer")
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"no file found at given path: {path}")
+        if self._engine not in ENGINES:
+            raise ValueError(f"unknown engine: '{self._engine}', available engines: {ENGINES}")
+        self._path = path
+        self._encoding = detect_encoding(path) if encoding is None else encoding
+
+        # index
+        index = get_eso_index(path, self._encoding)
+
+        # data dictionary
+        with io.StringIO(read_eso_segment(path, 0, index["data_start"], self._encoding), newline=None) as f:
+            self._annual_code, self._variables_by_freq, self._max_vars_num, _ = parse_eso_data_dictionary(
+                f,
+                print_function=self._print_function,
+                variables=variables,
+                frequencies=frequencies
+            )
+
+        # environments (parsed on demand)
+        if environments is not None:
+            environments = {title.lower() for title in environments}
+        self._environments_by_title = collections.OrderedDict()
+        for title, start, end in index["environments"]:
+            if environments is not None and title not in environments:
+                continue
+            self._environments_by_title[title] = None
+            self._environments_offsets[title] = (start, end)
+
+    def _get_environment(self, title):
+        # parses environment if needed (lazy mode)
+        if title in self._environments_offsets:
+            start, end = self._environments_offsets[title]
+            content = read_eso_segment(self._path, start, end, self._encoding) + "End of Data\n"
+            with io.StringIO(content, newline=None) as f:
+                # last environment with this title is kept (same as non lazy parsing)
+                env = parse_eso_data(
+                    f,
+                    self._annual_code,
+                    self._variables_by_freq,
+                    self._max_vars_num,
+                    print_function=self._print_function,
+                    engine=self._engine
+                )[title]
+            if self._start_year is not None:
+                env._dev_create_datetime_index(self._start_year)
+            self._environments_by_title[title] = env
+            del self._environments_offsets[title]
+        return self._environments_by_title[title]
+
+    def _get_environments(self):
+        # parses all environments if needed (lazy mode)
+        return collections.OrderedDict((title, self._get_environment(title)) for title in self._environments_by_title)
+
     # --------------------------------------------- public api ---------------------------------------------------------
     def create_datetime_index(self, start_year):
         """
@@ -48,9 +163,14 @@ class StandardOutput:
         Parameters
         ----------
         start_year: int
+
+        Notes
+        -----
+        In lazy mode, datetime index of environments that are not parsed yet will be created when they are parsed.
         """
-        for env in self._environments_by_title.values():
-            env._dev_create_datetime_index(start_year)
+        for title, env in self._environments_by_title.items():
+            if title not in self._environments_offsets:
+                env._dev_create_datetime_index(start_year)
         self._start_year = start_year
 
     def get_data(self, environment_title_or_num=-1, frequency=None):
@@ -81,7 +201,7 @@ class StandardOutput:
                 f"Available environments: {tuple(self._environments_by_title)}."
             )
 
-        return self._environments_by_title[environment_title].get_data(frequency=frequency)
+        return self._get_environment(environment_title).get_data(frequency=frequency)
 
     def get_environments(self):
         """
@@ -91,7 +211,7 @@ class StandardOutput:
         -------
         typing.Dict[str, opyplus.standard_output.output_environment.OutputEnvironment]
         """
-        return self._environments_by_title.copy()
+        return self._get_environments()
 
     def get_variables(self):
         """
@@ -115,7 +235,7 @@ class StandardOutput:
 
         # environments
         msg += "  environments\n"
-        for i, env in enumerate(self._environments_by_title.values()):
+        for i, env in enumerate(self._get_environments().values()):
             msg += textwrap.indent(env.get_info(env_num=i), "    ")
 
         # variables
@@ -145,8 +265,120 @@ class StandardOutput:
             os.mkdir(dir_path)
 
         # dump data
-        for i, env in enumerate(self._environments_by_title.values()):
+        for i, env in enumerate(self._get_environments().values()):
             slug_env_title = slugify(env.title)
             for freq, container in env._dev_get_data_conainers_by_freq().items():
                 file_path = os.path.join(dir_path, f"{i}#{slug_env_title}#{freq}.csv")
                 container.df.to_csv(file_path, sep=sep, decimal=decimal)
+
+    def to_cache(self, dir_path, storage=None):
+        """
+        Write standard output to a cache directory (binary columnar format), that can be read with from_cache.
+
+        Parameters
+        ----------
+        dir_path: str
+            cache directory. If it already exists, it must be empty or be a standard output cache (it is replaced).
+        storage: {'parquet', 'npy', None}
+            dataframes storage. If None (default), parquet is used if a parquet engine (pyarrow or fastparquet) is
+            installed, else npy (one numpy file per dtype).
+        """
+        if storage is None:
+            storage = get_default_storage()
+        if storage not in STORAGES:
+            raise ValueError(f"unknown storage: '{storage}', available storages: {STORAGES}")
+
+        # check we don't remove anything else than a cache
+        dir_path = os.path.abspath(dir_path)
+        if (
+                os.path.exists(dir_path) and
+                len(os.listdir(dir_path)) > 0 and
+                not os.path.isfile(os.path.join(dir_path, CACHE_METADATA_FILE_NAME))
+        ):
+            raise ValueError(f"directory is not empty and is not a standard output cache: {dir_path}")
+
+        # write in a temporary directory first (cache may be read by other processes)
+        temp_dir_path = tempfile.mkdtemp(dir=os.path.dirname(dir_path), suffix=".tmp")
+        try:
+            environments = []
+            for i, env in enumerate(self._get_environments().values()):
+                frames = dict()
+                for freq, container in env._dev_get_data_conainers_by_freq().items():
+                    frames[freq] = write_frame(container.df, os.path.join(temp_dir_path, f"{i}-{freq}"), storage)
+                environments.append(dict(
+                    title=env.title,
+                    latitude=env.latitude,
+                    longitude=env.longitude,
+                    timezone_offset=env.timezone_offset,
+                    elevation=env.elevation,
+                    frames=frames
+                ))
+            metadata = dict(
+                version=CACHE_VERSION,
+                storage=storage,
+                start_year=self._start_year,
+                variables_by_freq=collections.OrderedDict(
+                    (freq, [[v.code, v.key_value, v.name, v.unit, v.frequency, v.info] for v in variables])
+                    for freq, variables in self._variables_by_freq.items()
+                ),
+                environments=environments
+            )
+            with open(os.path.join(temp_dir_path, CACHE_METADATA_FILE_NAME), "w") as f:
+                json.dump(metadata, f)
+
+            # replace
+            if os.path.exists(dir_path):
+                shutil.rmtree(dir_path)
+            os.replace(temp_dir_path, dir_path)
+        except BaseException:
+            shutil.rmtree(temp_dir_path, ignore_errors=True)
+            raise
+
+    @classmethod
+    def from_cache(cls, dir_path):
+        """
+        Load standard output from a cache directory (see to_cache).
+
+        Parameters
+        ----------
+        dir_path: str
+
+        Returns
+        -------
+        StandardOutput
+        """
+        with open(os.path.join(dir_path, CACHE_METADATA_FILE_NAME)) as f:
+            metadata = json.load(f)
+        if metadata["version"] != CACHE_VERSION:
+            raise ValueError(f"unsupported standard output cache version: {metadata['version']} ({dir_path})")
+
+        variables_by_freq = collections.OrderedDict(
+            (freq, [OutputVariable(*variable_data) for variable_data in variables_data])
+            for freq, variables_data in metadata["variables_by_freq"].items()
+        )
+        environments_by_title = collections.OrderedDict()
+        for i, env_data in enumerate(metadata["environments"]):
+            env = OutputEnvironment(
+                env_data["title"],
+                env_data["latitude"],
+                env_data["longitude"],
+                env_data["timezone_offset"],
+                env_data["elevation"],
+                variables_by_freq
+            )
+            env._dev_set_dfs(dict(
+                (freq, read_frame(os.path.join(dir_path, f"{i}-{freq}"), info, metadata["storage"]))
+                for freq, info in env_data["frames"].items()
+            ))
+            environments_by_title[env.title] = env
+
+        # create standard output without parsing
+        standard_output = cls.__new__(cls)
+        standard_output._path = None
+        standard_output._start_year = metadata["start_year"]
+        standard_output._print_function = lambda x: None
+        standard_output._engine = "default"
+        standard_output._environments_offsets = {}
+        standard_output._environments_by_title = environments_by_title
+        standard_output._variables_by_freq = variables_by_freq
+        return standard_output
@@ -10,7 +10,7 @@ import threading
 import contextlib
 import textwrap
 
-from charset_normalizer import from_path
+from charset_normalizer import from_path, from_bytes
 import pandas as pd
 
 
@@ -280,13 +280,59 @@ def multi_mode_write(buffer_writer, string_writer, buffer_or_path=None):
         buffer_writer(buffer)
 
 
-def to_buffer(buffer_or_path):
+# detected encodings by (path, modification time, size, detection mode)
+_detected_encodings = {}
+
+
+def detect_encoding(path):
+    """
+    Detect the encoding of a file, depending on CONF.encoding_detection.
+
+    Detection results are cached by path (the cache is invalidated if the file is modified).
+
+    Parameters
+    ----------
+    path: str
+
+    Returns
+    -------
+    str
+        detected encoding, or CONF.encoding if detection is off or failed
+    """
+    mode = CONF.encoding_detection
+    if mode == "off":
+        return CONF.encoding
+    if mode not in ("head", "full"):
+        raise ValueError(f"unknown encoding detection mode: '{mode}', expected 'off', 'head' or 'full'")
+
+    # check cache
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size, mode, CONF.encoding_detection_head_size)
+    if key in _detected_encodings:
+        return _detected_encodings[key]
+
+    # detect
+    if mode == "head":
+        with open(path, "rb") as f:
+            match = from_bytes(f.read(CONF.encoding_detection_head_size)).best()
+    else:
+        match = from_path(path).best()
+    encoding = CONF.encoding if match is None else match.encoding
+
+    # store and return
+    _detected_encodings[key] = encoding
+    return encoding
+
+
+def to_buffer(buffer_or_path, encoding=None):
     """
     Get a buffer from a buffer or a path.
 
     Parameters
     ----------
     buffer_or_path: typing.StringIO or str
+    encoding: str or None
+        only used if buffer_or_path is a path. If None (default), encoding is detected (see detect_encoding).
 
     Returns
     -------
@@ -296,8 +342,9 @@ def to_buffer(buffer_or_path):
         if not os.path.isfile(buffer_or_path):
             raise FileNotFoundError(f"no file found at given path: {buffer_or_path}")
         path = buffer_or_path
-        encoding = from_path(buffer_or_path).best()
-        buffer = open(buffer_or_path, encoding=encoding.encoding, errors="ignore")
+        if encoding is None:
+            encoding = detect_encoding(path)
+        buffer = open(buffer_or_path, encoding=encoding, errors="ignore")
     else:
         path = None
         buffer = buffer_or_path
@@ -324,3 +371,29 @@ def version_str_to_version(version_str):
         raise ValueError(f"incorrect format: {version_str}")
 
     return tuple(raw_version[:3])
+
+
+def check_datetime_column_range(series, name, min_value, max_value):
+    """
+    Check all values of a datetime component column are in given range.
+
+    pandas.to_datetime rolls out of range hours and minutes over to the next or previous day, where datetime.datetime
+    raises: columns must be checked before vectorized datetime creation.
+
+    Parameters
+    ----------
+    series: pandas.Series
+    name: str
+        component name (hour, minute...), used in error message
+    min_value: int
+    max_value: int
+
+    Raises
+    ------
+    ValueError
+        if a value is out of range
+    """
+    invalid = series[(series < min_value) | (series > max_value)]
+    if len(invalid) > 0:
+        raise ValueError(
+            f"{name} must be in {min_value}..{max_value}, found {invalid.iloc[0]} (index: {invalid.index[0]})")
@@ -41,6 +41,9 @@ class Ddy(Epgm):
         If True, will raise an exception if a required field is missing. If False, not not perform any checks.
     idd_or_version: (expert) if you want to use a specific idd, you can require a specific version (x.x.x), or
         directly provide an IDD object.
+    trusted: boolean, default False
+        If True, json_data must have been written by opyplus: values are considered as already normalized and are not
+        validated (see load).
 
     Notes
     -----
@@ -50,13 +53,14 @@ class Ddy(Epgm):
 
     _dev_restrict_table_refs = DDY_TABLE_DESCRIPTORS_REF
 
-    def __init__(self, json_data=None, check_required=True, check_length=True, idd_or_version=None):
+    def __init__(self, json_data=None, check_required=True, check_length=True, idd_or_version=None, trusted=False):
         # call super
         super().__init__(
             json_data=json_data,
             check_required=check_required,
             check_length=check_length,
-            idd_or_version=idd_or_version
+            idd_or_version=idd_or_version,
+            trusted=trusted
         )
 
     # --------------------------------------------- public api ---------------------------------------------------------
@@ -81,7 +85,7 @@ class Ddy(Epgm):
         """
         s = "Ddy\n"
 
-        for table in self._tables.values():
+        for table in self._dev_iter_created_tables():
             records_nb = len(table)
             if records_nb == 0:
                 continue
@@ -110,11 +114,20 @@ class Ddy(Epgm):
     @classmethod
     def from_ddy(
             cls,
-            buffer_or_path
+            buffer_or_path,
+            encoding=None
     ):
         """
         Load Ddy from a .ddy file.
 
+        Parameters
+        ----------
+        buffer_or_path: str or typing.StringIO
+            ddy buffer or path
+        encoding: str or None
+            file encoding (only used if buffer_or_path is a path). If None (default), encoding is detected (see
+            CONF.encoding_detection).
+
         Returns
         -------
         Ddy
@@ -122,5 +135,6 @@ class Ddy(Epgm):
         return cls._create_from_buffer_or_path(
             parse_idf,
             buffer_or_path,
-            idd_or_version=CONF.default_idd_version
+            idd_or_version=CONF.default_idd_version,
+            encoding=encoding
         )
@@ -1,4 +1,6 @@
 """Functions to parse epw files."""
+import copy
+
 import pandas as pd
 
 from opyplus import CONF
@@ -25,7 +27,54 @@ def parse_epw(file_like) -> WeatherData:
     -------
     WeatherData
     """
-    # parse header
+    headers = _parse_headers(file_like)
+    return WeatherData(_read_weather_series(file_like), **headers)
+
+
+def iter_epw_chunks(file_like, chunksize):
+    """
+    Parse an epw file by chunks of rows.
+
+    Headers are only parsed once, and each chunk of rows is sanitized as soon as it is read.
+
+    Parameters
+    ----------
+    file_like: typing.StringIO
+        epw file to parse
+    chunksize: int
+        number of rows by chunk
+
+    Yields
+    ------
+    WeatherData
+        weather data of chunk rows (all chunks have the same headers)
+    """
+    headers = _parse_headers(file_like)
+    for i, weather_series in enumerate(_read_weather_series(file_like, chunksize=chunksize)):
+        if i == 0:
+            yield WeatherData(weather_series, **headers)
+        else:
+            # start day of week of header only concerns first chunk
+            yield WeatherData(weather_series, **dict(copy.deepcopy(headers), start_day_of_week=None))
+
+
+def _read_weather_series(file_like, chunksize=None):
+    # returns dataframe, or dataframes iterator if chunksize is given
+    # dtypes are given by column number (files may not have all columns)
+    dtypes = {i: v[2] for i, v in enumerate(COLUMNS.values())}
+    reader = pd.read_csv(file_like, header=None, dtype=dtypes, encoding=CONF.encoding, chunksize=chunksize)
+    if chunksize is None:
+        return _set_weather_series_columns(reader)
+    return (_set_weather_series_columns(weather_series) for weather_series in reader)
+
+
+def _set_weather_series_columns(weather_series):
+    weather_series.columns = list(COLUMNS)[:len(weather_series.columns)]
+    return weather_series
+
+
+def _parse_headers(file_like):
+    # returns WeatherData init kwargs (except weather_series)
 
     # location
     location_row_l = _get_row_l(next(file_like))
@@ -112,16 +161,11 @@ def parse_epw(file_like) -> WeatherData:
     if start_day_of_week == "":
         start_day_of_week = None
 
-    # load dataframe
-    weather_series = pd.read_csv(file_like, header=None, encoding=CONF.encoding)
-    weather_series.columns = list(COLUMNS)[:len(weather_series.columns)]
-
-    return WeatherData(
-        weather_series,
-        latitude,
-        longitude,
-        timezone_offset,
-        elevation,
+    return dict(
+        latitude=latitude,
+        longitude=longitude,
+        timezone_offset=timezone_offset,
+        elevation=elevation,
         city=city,
         state_province_region=state_province_region,
         country=country,
@@ -6,7 +6,7 @@ import numpy as np
 import pandas as pd
 from pandas.testing import assert_index_equal
 
-from ..util import multi_mode_write, get_mono_line_copyright_message, to_buffer
+from ..util import multi_mode_write, get_mono_line_copyright_message, to_buffer, check_datetime_column_range
 from ..exceptions import DatetimeInstantsCreationError
 
 WEEK_DAYS = ("Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday")
@@ -283,18 +283,16 @@ class WeatherData:
         """
         # create and set index
 
-        # 1. we change eplus hour from 1..24 to 0..23
+        # 1. we change eplus hour from 1..24 to 0..23 (pandas would roll other hours over to next or previous day)
         # 2. we add one hour to stay in right convention
-        self._weather_series.index = pd.DatetimeIndex(self._weather_series.apply(
-            # we cast to ints because of a pandas bug on apply which returns floats
-            lambda x: dt.datetime(
-                int(x.year) if start_year is None else start_year,
-                int(x.month),
-                int(x.day),
-                int(x.hour - 1)
-            ),
-            axis=1
-        )) + pd.Timedelta(hours=1)
+        check_datetime_column_range(self._weather_series["hour"], "hour", 1, 24)
+        check_datetime_column_range(self._weather_series["minute"], "minute", 0, 60)  # epw convention, not used
+        self._weather_series.index = pd.DatetimeIndex(pd.to_datetime(pd.DataFrame(dict(
+            year=self._weather_series["year"].astype("int64") if start_year is None else start_year,
+            month=self._weather_series["month"].astype("int64"),
+            day=self._weather_series["day"].astype("int64"),
+            hour=self._weather_series["hour"].astype("int64") - 1
+        )))) + pd.Timedelta(hours=1)
 
         # force frequency if needed
         if self._weather_series.index.freq != "H":
@@ -418,7 +416,7 @@ class WeatherData:
 
     # ------------------------------------------------- save/load ------------------------------------------------------
     @classmethod
-    def load(cls, buffer_or_path, create_datetime_instants=False, start_year=None) -> "WeatherData":
+    def load(cls, buffer_or_path, create_datetime_instants=False, start_year=None, encoding=None) -> "WeatherData":
         """
         Load weather data from an epw file.
 
@@ -431,12 +429,20 @@ class WeatherData:
         start_year: int or None
             only used if create_datetime_instants is True
             if given, will force year column with start_year (multi-year not supported for now)
+        encoding: str or None
+            file encoding (only used if buffer_or_path is a path). If None (default), encoding is detected (see
+            CONF.encoding_detection).
 
         Returns
         -------
         WeatherData instance.
         """
-        return cls.from_epw(buffer_or_path, create_datetime_instants=create_datetime_instants, start_year=start_year)
+        return cls.from_epw(
+            buffer_or_path,
+            create_datetime_instants=create_datetime_instants,
+            start_year=start_year,
+            encoding=encoding
+        )
 
     def save(self, buffer_or_path=None, use_datetimes=True):
         """
@@ -458,16 +464,45 @@ class WeatherData:
 
     # ------------------------------------------- import/export --------------------------------------------------------
     @classmethod
-    def from_epw(cls, buffer_or_path, create_datetime_instants=False, start_year=None) -> "WeatherData":
+    def from_epw(cls, buffer_or_path, create_datetime_instants=False, start_year=None, encoding=None) -> "WeatherData":
         """See load."""
         from .epw_parse import parse_epw
-        _, buffer = to_buffer(buffer_or_path)
+        _, buffer = to_buffer(buffer_or_path, encoding=encoding)
         with buffer as f:
             weather_data = parse_epw(f)
         if create_datetime_instants:
             weather_data.create_datetime_instants(start_year=start_year)
         return weather_data
 
+    @classmethod
+    def iter_chunks(cls, buffer_or_path, chunksize=8760, encoding=None):
+        """
+        Iterate over an epw file by chunks of rows, without loading the whole weather series in memory.
+
+        Useful for big (for example multi-year) files.
+
+        Parameters
+        ----------
+        buffer_or_path: str or typing.StringIO
+            buffer or path containing epw format.
+        chunksize: int
+            number of rows by chunk (default 8760: one year of hourly data)
+        encoding: str or None
+            file encoding (only used if buffer_or_path is a path). If None (default), encoding is detected (see
+            CONF.encoding_detection).
+
+        Yields
+        ------
+        WeatherData
+            weather data of chunk rows. Headers are parsed once and are the same for all chunks (except start day of
+            week, which is calculated from data for all chunks but first). Weather series index is the row number
+            in file.
+        """
+        from .epw_parse import iter_epw_chunks
+        _, buffer = to_buffer(buffer_or_path, encoding=encoding)
+        with buffer as f:
+            yield from iter_epw_chunks(f, chunksize)
+
     def to_epw(self, buffer_or_path=None, use_datetimes=True):
         """See save."""
         # copy (will be modified)
@@ -505,46 +540,38 @@ class WeatherData:
 
 
 def _sanitize_weather_series(df):
-    # copy df (we will modify it)
-    df = df.copy()
-
     # check dataframe
     if not isinstance(df, pd.DataFrame):
         raise TypeError("Weather series must be a pandas DataFrame.")
 
-    # create df
-    df = pd.DataFrame(collections.OrderedDict((k, df.get(k)) for k in COLUMNS))
-
-    # replace all missing values, unfortunately since pandas 1.1.0 we have to iterate on columns
-    for k, v in COLUMNS.items():
-        if v[2] is str:
-            if v[1] is None:
-                df[k].fillna(value="", inplace=True)
-            else:
-                df[k].replace(
-                    to_replace=v[1],
-                    value="",
-                    inplace=True,
-                )
-        else:
-            if v[1] is None:
-                df[k].fillna(value=np.nan, inplace=True)
+    # columns are sanitized one by one (given dataframe is not modified, and is never copied as a whole)
+    columns = collections.OrderedDict()
+    for k, (used, missing, dtype) in COLUMNS.items():
+        column = df.get(k)
+        if column is None:
+            column = pd.Series(None, index=df.index, dtype=object)
+
+        # replace missing values (string columns may have been read as numbers or as strings)
+        if dtype is str:
+            if missing is None:
+                column = column.fillna(value="")
             else:
-                df[k].replace(
-                    to_replace=v[1],
-                    value=np.nan,
-                    inplace=True,
-                )
+                column = column.replace(to_replace=[missing, str(missing)], value="")
+        elif missing is not None:
+            column = column.replace(to_replace=missing, value=np.nan)
+        columns[k] = column
 
     # check that all used columns with no missing value aren't null
     not_null = [k for k, v in COLUMNS.items() if (v[0] and v[1] is None)]
-    if df[not_null].isnull().sum().sum() > 0:
+    null_counts = pd.Series({k: columns[k].isnull().sum() for k in not_null})
+    if null_counts.sum() > 0:
         raise ValueError(
-            f"given dataframe contains empty values on some mandatory columns:\n{df[not_null].isnull().sum()}"
+            f"given dataframe contains empty values on some mandatory columns:\n{null_counts}"
         )
 
-    # force dtypes
-    df = df.astype({k: v[2] for k, v in COLUMNS.items()})
+    # force dtypes (no copy if column already has the right dtype)
+    for k, (used, missing, dtype) in COLUMNS.items():
+        if columns[k].dtype != np.dtype(dtype):
+            columns[k] = columns[k].astype(dtype)
 
-    # return
-    return df
+    return pd.DataFrame(columns, index=df.index, copy=False)
@@ -1,6 +1,11 @@
+import io
+import os
+import tempfile
 import unittest
+from unittest import mock
 
 import opyplus as op
+from opyplus.idd import table_descriptor as table_descriptor_module
 
 from tests.util import iter_eplus_versions
 
@@ -54,3 +59,303 @@ class EpmNoTemplateTest(unittest.TestCase):
             {'_comment': '', 'name': 'list1', 'zone_1_name': 'zone1', 'zone_2_name': 'zone2'}
         )
 
+    def test_lazy_tables(self):
+        epm = op.Epm()
+
+        # tables are only created when accessed
+        self.assertEqual(0, len(epm._tables))
+        zone_table = epm.zone
+        self.assertIs(zone_table, epm.Zone)
+        self.assertEqual(1, len(epm._tables))
+
+        # iteration and json export still see all tables
+        self.assertEqual(len(epm._dev_table_descriptors), len(list(epm)))
+        self.assertEqual(len(epm._dev_table_descriptors) + 2, len(epm.to_json_data()))
+
+    def test_extensible_field_index(self):
+        epm = op.Epm()
+        table_descriptor = epm.zonelist._dev_descriptor
+        self.assertEqual(0, table_descriptor.get_field_index("name"))
+        self.assertEqual(1, table_descriptor.get_field_index("zone_1_name"))
+        self.assertEqual(12, table_descriptor.get_field_index("zone_12_name"))
+        self.assertEqual(12, table_descriptor.get_field_index("zone_12_name"))  # cached
+        self.assertRaises(AttributeError, table_descriptor.get_field_index, "zone_0_name")
+        self.assertRaises(AttributeError, table_descriptor.get_field_index, "unknown_field")
+
+        # cache is bounded, least recently used refs are dropped
+        table_descriptor._extensible_field_indexes.clear()
+        with mock.patch.object(table_descriptor_module, "_EXTENSIBLE_FIELD_INDEXES_CACHE_SIZE", 2):
+            for ref in ("zone_1_name", "zone_2_name", "zone_1_name", "zone_3_name"):
+                table_descriptor.get_field_index(ref)
+        self.assertEqual(["zone_1_name", "zone_3_name"], list(table_descriptor._extensible_field_indexes))
+
+    def test_record_storage(self):
+        epm = op.Epm()
+        epm.zone.add(name="z1")
+        epm.zone.add(name="z2")
+        zone_list = epm.zonelist.add(name="list1", zone_1_name="z1", zone_2_name="z2")
+        self.assertFalse(hasattr(zone_list, "__dict__"))
+        self.assertEqual(3, len(zone_list))
+
+        # emptying last field shrinks record
+        zone_list.zone_2_name = None
+        self.assertEqual(2, len(zone_list))
+        self.assertIsNone(zone_list.zone_2_name)
+        self.assertEqual({"_comment": "", 0: "list1", 1: "z1"}, zone_list.to_json_data())
+
+    def test_record_sort_key(self):
+        epm = op.Epm(check_required=False)
+        zone_a = epm.zone.add(name="a")
+        zone_b = epm.zone.add(name="b")
+        self.assertEqual([zone_a, zone_b], list(epm.zone.select()))
+
+        # key is reset on update
+        zone_a.name = "c"
+        self.assertEqual([zone_b, zone_a], list(epm.zone.select()))
+
+        # key of pointing records is reset when pointed record is renamed
+        epm.construction.add(name="c")
+        bsd = epm.BuildingSurface_Detailed.add(name="bsd", surface_type="wall", construction_name="c", zone_name=zone_b)
+        self.assertIn((1, "b"), bsd._dev_get_sort_key())
+        zone_b.name = "d"
+        self.assertIn((1, "d"), bsd._dev_get_sort_key())
+
+    def test_lazy_queryset(self):
+        epm = op.Epm(check_required=False)
+        for name in ("c", "a", "b"):
+            epm.zone.add(name=name)
+
+        # filtering and counting does not sort
+        qs = epm.zone.select(lambda x: x.name != "b")
+        self.assertIsNone(qs._sorted_records)
+        self.assertEqual(2, len(qs))
+        self.assertEqual("a", qs[0].name)
+        self.assertIsNone(qs._sorted_records)
+
+        # order is observed: records are sorted, and chained selects keep them sorted
+        self.assertEqual(["a", "c"], [z.name for z in qs])
+        sub_qs = qs.select()
+        self.assertIsNotNone(sub_qs._sorted_records)
+        self.assertEqual(["a", "c"], [z.name for z in sub_qs])
+        self.assertEqual("b", epm.zone.one(lambda x: x.name == "b").name)
+        self.assertEqual(qs, epm.zone.select(lambda x: x.name in ("a", "c")))
+
+        # public constructor still ensures uniqueness
+        self.assertEqual(2, len(qs + sub_qs))
+
+        # records deleted before order is observed (loaded records don't have a sort key yet)
+        epm = op.Epm(json_data={"Zone": [{"name": name} for name in "cab"]}, check_required=False)
+        qs = epm.zone.select()
+        first_qs = epm.zone.select()
+        epm.zone.one("a").delete()
+        self.assertEqual([None, "b", "c"], [None if r._table is None else r.name for r in qs])
+        self.assertIsNone(first_qs[0]._table)
+
+    def test_table_index(self):
+        epm = op.Epm(check_required=False)
+        epm.construction.add(name="c")
+        zones = [epm.zone.add(name=f"z{i}") for i in range(3)]
+        for i in range(6):
+            epm.BuildingSurface_Detailed.add(
+                name=f"bsd{i}", surface_type="wall", construction_name="c", zone_name=zones[i % 3])
+        bsds = epm.BuildingSurface_Detailed
+
+        # same results with and without index
+        for index in (False, True):
+            if index:
+                bsds.create_index("zone_name")
+            self.assertEqual(["bsd0", "bsd3"], [r.name for r in bsds.filter(zone_name="Z0")])
+            self.assertEqual(["bsd1", "bsd4"], [r.name for r in bsds.filter(zone_name=zones[1])])
+            self.assertEqual(["bsd2"], [r.name for r in bsds.filter(zone_name="z2", name="bsd2")])
+            self.assertEqual(0, len(bsds.filter(zone_name="unknown")))
+
+        # index follows updates, pointed record renames, additions and deletions
+        bsds.one("bsd0").zone_name = zones[1]
+        zones[2].name = "z2bis"
+        bsds.add(name="bsd6", surface_type="wall", construction_name="c", zone_name="z2bis")
+        bsds.one("bsd4").delete()
+        self.assertEqual(["bsd3"], [r.name for r in bsds.filter(zone_name="z0")])
+        self.assertEqual(["bsd0", "bsd1"], [r.name for r in bsds.filter(zone_name="z1")])
+        self.assertEqual(0, len(bsds.filter(zone_name="z2")))
+        self.assertEqual(["bsd2", "bsd5", "bsd6"], [r.name for r in bsds.filter(zone_name="z2bis")])
+
+        # index follows pointed record deletion
+        zones[0].delete()
+        self.assertEqual(["bsd3"], [r.name for r in bsds.filter(zone_name=None)])
+
+    def test_queryset_id_lookup(self):
+        epm = op.Epm(check_required=False)
+        for i in range(5):
+            epm.zone.add(name=f"z{i}")
+        qs = epm.zone.select(lambda x: x.name != "z0")
+
+        self.assertEqual("z1", qs.one("z1").name)
+        self.assertEqual(["z3", "z2"], [z.name for z in qs.get_many(["z3", "z2"])])
+        self.assertRaises(op.RecordDoesNotExistError, qs.one, "z0")  # in table, not in queryset
+        self.assertRaises(op.RecordDoesNotExistError, qs.get_many, ["z1", "unknown"])
+
+        # renamed records are found with their new id
+        qs.one("z1").name = "z1bis"
+        self.assertEqual("z1bis", qs.one("z1bis").name)
+        self.assertRaises(op.RecordDoesNotExistError, qs.one, "z1")
+
+    def test_to_idf_path(self):
+        epm = op.Epm(check_required=False)
+        for i in range(3):
+            epm.zone.add(name=f"z{i}")
+        epm.building.add(name="b")
+        with tempfile.TemporaryDirectory() as dir_path:
+            path = os.path.join(dir_path, "model.idf")
+            epm.to_idf(path)
+            with open(path) as f:
+                self.assertEqual(epm.to_idf(dump_external_files=False), f.read())
+
+    def test_bulk_populate(self):
+        # records created in bulk (add, load) must have the same values as records updated field by field
+        data = dict(name="  Zone\n  Ünique  ", x_origin="1.5", multiplier="2.0", ceiling_height="AutoCalculate")
+        epm = op.Epm()
+        zone = epm.zone.add(**data)
+        updated_zone = op.Epm().zone.add(name="z")
+        updated_zone.update(**data)
+        self.assertEqual("zone unique", zone.name)
+        self.assertEqual(updated_zone.to_json_data(), zone.to_json_data())
+
+        # links and hooks are activated
+        zone_list = epm.zonelist.add(name="list", zone_1_name="ZONE UNIQUE")
+        self.assertEqual(zone, zone_list.zone_1_name)
+
+        # validation errors
+        self.assertRaises(op.FieldValidationError, epm.zone.add, name="  ")
+        self.assertRaises(op.FieldValidationError, epm.zone.add, name="z2", multiplier="2.5")
+        self.assertRaises(op.FieldValidationError, epm.BuildingSurface_Detailed.add, name="bsd")
+
+        # out of range field index is rejected before values are allocated
+        with self.assertRaises(IndexError) as cm:
+            op.Epm(json_data={"Zone": [{"0": "z", "100000000": "x"}]})
+        self.assertIn("index out of range", str(cm.exception))
+
+    def test_json_round_trip(self):
+        epm = op.Epm()
+        zone = epm.zone.add(name="Zone 1", x_origin=1.5, multiplier=2)
+        epm.zonelist.add(name="list", zone_1_name=zone)
+        json_epm = op.Epm.from_json(io.StringIO(epm.to_json()))
+        self.assertEqual(epm.to_idf(), json_epm.to_idf())
+        self.assertEqual(json_epm.zone.one(), json_epm.zonelist.one().zone_1_name)
+
+    def test_trusted_load(self):
+        epm = op.Epm()
+        zone = epm.zone.add(name="Zone 1", x_origin=1.5, multiplier=2)
+        epm.zonelist.add(name="list", zone_1_name=zone)
+        idf = epm.to_idf()
+        json_str = epm.to_json()
+
+        for trusted_epm in (
+                op.Epm.load(io.StringIO(idf), trusted=True),
+                op.Epm.from_idf(io.StringIO(idf), trusted=True),
+                op.Epm.from_json(io.StringIO(json_str), trusted=True),
+                op.Epm.from_json(io.StringIO(json_str))
+        ):
+            self.assertEqual(idf, trusted_epm.to_idf())
+            # links and hooks are registered
+            trusted_zone = trusted_epm.zone.one()
+            self.assertEqual(trusted_zone, trusted_epm.zonelist.one().zone_1_name)
+            trusted_zone.name = "new name"
+            self.assertEqual("new name", trusted_epm.zonelist.one()[1].name)
+
+        # trusted data is not validated
+        incomplete_idf = "BuildingSurface:Detailed, bsd;"
+        self.assertRaises(op.FieldValidationError, op.Epm.from_idf, io.StringIO(incomplete_idf))
+        self.assertEqual(1, len(op.Epm.from_idf(io.StringIO(incomplete_idf), trusted=True).BuildingSurface_Detailed))
+
+    def test_bulk_register_errors(self):
+        # all unresolved links are reported together
+        with self.assertRaises(op.FieldValidationError) as cm:
+            op.Epm(json_data=dict(
+                Zone=[dict(name="z")],
+                ZoneList=[dict(name="list", zone_1_name="z", zone_2_name="unknown_1", zone_3_name="unknown_2")]
+            ))
+        self.assertIn("unknown_1", str(cm.exception))
+        self.assertIn("unknown_2", str(cm.exception))
+
+        # duplicate keys
+        self.assertRaises(
+            op.FieldValidationError,
+            op.Epm,
+            json_data=dict(Zone=[dict(name="z"), dict(name="Z")])
+        )
+
+    def test_failed_batch_add(self):
+        epm = op.Epm()
+        epm.zone.add(name="z0")
+        epm.zonelist.add(name="list0", zone_1_name="z0")
+        idf = epm.to_idf()
+        relations_manager = epm._dev_relations_manager
+        record_hooks = dict(relations_manager._record_hooks)
+        links_by_target = {k: set(v) for k, v in relations_manager._links_by_target.items()}
+
+        for table_ref, records_data in (
+                ("zonelist", [dict(name="list1", zone_1_name="z0"), dict(name="list2", zone_1_name="unknown")]),
+                ("zone", [dict(name="z1"), dict(name="Z0")]),
+                ("zone", [dict(name="z1"), dict(name="Z1")]),
+                ("zone", [dict(name="z1"), dict(name="z2", x_origin="not a number")])
+        ):
+            with self.subTest(records_data=records_data):
+                self.assertRaises(op.FieldValidationError, getattr(epm, table_ref).batch_add, records_data)
+
+                # epgm is unchanged
+                self.assertEqual(idf, epm.to_idf())
+                self.assertEqual(record_hooks, relations_manager._record_hooks)
+                self.assertEqual(links_by_target, relations_manager._links_by_target)
+                self.assertEqual(1, len(epm.zone.one().get_pointing_records().zonelist))
+
+        # failed records can be added again once corrected
+        epm.zonelist.batch_add([dict(name="list1", zone_1_name="z0"), dict(name="list2", zone_1_name="z0")])
+        self.assertEqual(3, len(epm.zone.one().get_pointing_records().zonelist))
+
+    def test_batched_delete(self):
+        for check_required in (True, False):
+            epm = op.Epm(check_required=check_required)
+            epm.zone.batch_add([dict(name=f"z{i}") for i in range(3)])
+            zone_list = epm.zonelist.add(name="list", zone_1_name="z0", zone_2_name="z2")
+
+            if check_required:
+                # required pointing field: nothing is modified
+                idf = epm.to_idf()
+                self.assertRaises(op.FieldValidationError, epm.zone.delete)
+                self.assertEqual(idf, epm.to_idf())
+                continue
+
+            # pointing fields are emptied
+            epm.zone.select(lambda x: x.name != "z0").delete()
+            self.assertEqual(["z0"], [z.name for z in epm.zone])
+            self.assertEqual(2, len(zone_list))
+            self.assertEqual(zone_list, epm.zone.one().get_pointing_records().zonelist.one())
+
+    def test_dependency_graph(self):
+        epm = op.Epm()
+        material = epm.Material_NoMass.add(name="m", roughness="smooth", thermal_resistance=1)
+        construction = epm.Construction.add(name="c", outside_layer=material)
+        unused_construction = epm.Construction.add(name="unused", outside_layer=material)
+        zone = epm.zone.add(name="z")
+        zone_list = epm.zonelist.add(name="list", zone_1_name=zone)
+
+        # closure
+        def get_records(multi_table_queryset):
+            return {r for table_ref in multi_table_queryset for r in getattr(multi_table_queryset, table_ref)}
+
+        self.assertEqual({zone_list, zone}, get_records(epm.get_dependency_closure([zone_list])))
+        self.assertEqual(
+            {material, construction, unused_construction},
+            get_records(epm.get_dependency_closure([material], "pointing"))
+        )
+        self.assertRaises(ValueError, epm.get_dependency_closure, [zone], "unknown")
+
+        # graph
+        graph = epm.get_dependency_graph()
+        self.assertEqual(5, len(graph))
+        self.assertEqual((graph.records.index(zone),), graph.pointed[graph.records.index(zone_list)])
+        self.assertEqual((graph.records.index(zone_list),), graph.pointing[graph.records.index(zone)])
+        self.assertEqual({construction, unused_construction, zone_list}, set(graph.get_orphans()))
+        order = graph.get_topological_order()
+        self.assertLess(order.index(material), order.index(construction))
+        self.assertLess(order.index(zone), order.index(zone_list))
@@ -1,6 +1,12 @@
+import os
+import pickle
+import tempfile
 import unittest
+from unittest import mock
 
-from opyplus.idd.idd import Idd
+from opyplus import CONF
+from opyplus.idd import idd as idd_module
+from opyplus.idd.idd import Idd, _IDD_CACHE
 
 from tests.util import iter_eplus_versions
 
@@ -10,4 +16,51 @@ class IddTest(unittest.TestCase):
         for _ in iter_eplus_versions(self):
             idd = Idd()
 
+    def test_disk_cache(self):
+        initial_cache_dir_path = CONF.idd_cache_dir_path
+        initial_memory_cache = _IDD_CACHE.copy()
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir_path:
+                CONF.idd_cache_dir_path = temp_dir_path
 
+                # first call parses idd and writes cache
+                _IDD_CACHE.clear()
+                idd = Idd._dev_get_from_cache(CONF.default_idd_version)
+                cache_file_names = os.listdir(temp_dir_path)
+                self.assertEqual(1, len(cache_file_names))
+
+                # second call (new process simulation) loads cache
+                _IDD_CACHE.clear()
+                cached_idd = Idd._dev_get_from_cache(CONF.default_idd_version)
+                self.assertIsNot(idd, cached_idd)
+                self.assertEqual(idd.version, cached_idd.version)
+                self.assertEqual(list(idd.table_descriptors), list(cached_idd.table_descriptors))
+                self.assertEqual(
+                    idd.table_descriptors["zone"].get_info(),
+                    cached_idd.table_descriptors["zone"].get_info()
+                )
+
+                # corrupted cache is rebuilt
+                cache_path = os.path.join(temp_dir_path, cache_file_names[0])
+                with open(cache_path, "wb") as f:
+                    f.write(b"corrupted")
+                _IDD_CACHE.clear()
+                with self.assertLogs("opyplus.idd.idd", level="WARNING"):
+                    rebuilt_idd = Idd._dev_get_from_cache(CONF.default_idd_version)
+                self.assertEqual(list(idd.table_descriptors), list(rebuilt_idd.table_descriptors))
+                self.assertGreater(os.path.getsize(cache_path), len(b"corrupted"))
+
+                # cache written by other code (cache format or sources change) is not used
+                with open(cache_path, "rb") as f:
+                    cache_key = pickle.load(f)
+                with mock.patch.object(idd_module, "_DISK_CACHE_FORMAT", idd_module._DISK_CACHE_FORMAT + 1):
+                    _IDD_CACHE.clear()
+                    with mock.patch.object(Idd, "_parse", autospec=True, side_effect=Idd._parse) as parse_mock:
+                        Idd._dev_get_from_cache(CONF.default_idd_version)
+                    parse_mock.assert_called_once()
+                with open(cache_path, "rb") as f:
+                    self.assertNotEqual(cache_key, pickle.load(f))
+        finally:
+            CONF.idd_cache_dir_path = initial_cache_dir_path
+            _IDD_CACHE.clear()
+            _IDD_CACHE.update(initial_memory_cache)
@@ -1,9 +1,12 @@
 import unittest
 import os
+import io
+import tempfile
 
 from tests.util import iter_eplus_versions
 
 from opyplus.epgm.parse_idf import parse_idf
+from opyplus.util import detect_encoding, to_buffer
 from opyplus.compatibility import get_eplus_base_dir_path
 from opyplus import CONF
 
@@ -21,3 +24,41 @@ class IdfParseTest(unittest.TestCase):
                 json_data = parse_idf(f)
 
         # todo: [GL] test properly
+
+    def test_records_and_comments(self):
+        json_data = parse_idf(io.StringIO(
+            "! head comment\n"
+            "Lead Input;\n"
+            "Zone,\n"
+            "  z1, ! name\n"
+            "  ,\n"
+            "  1;   ! x origin\n"
+            "! not a head comment\n"
+            "Zone,z2;  Building, b;\n"
+            "End Lead Input;\n"
+        ))
+        self.assertEqual(
+            {"Zone": [["z1", "", "1"], ["z2"]], "Building": [["b"]], "_comment": "head comment\n"},
+            json_data
+        )
+
+    def test_encoding(self):
+        initial_detection = CONF.encoding_detection
+        try:
+            with tempfile.TemporaryDirectory() as dir_path:
+                path = os.path.join(dir_path, "model.idf")
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write("! commentaire été\nZone, zone été;\n")
+
+                for detection in ("full", "head"):
+                    CONF.encoding_detection = detection
+                    self.assertEqual("utf_8", detect_encoding(path))
+                CONF.encoding_detection = "off"
+                self.assertEqual(CONF.encoding, detect_encoding(path))
+
+                # explicit encoding is used as is
+                _, buffer = to_buffer(path, encoding="utf-8")
+                with buffer as f:
+                    self.assertEqual({"Zone": [["zone été"]], "_comment": "commentaire été\n"}, parse_idf(f))
+        finally:
+            CONF.encoding_detection = initial_detection
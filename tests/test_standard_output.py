@@ -1,8 +1,19 @@
+import io
 import os
+import shutil
+import tempfile
 import unittest
+from unittest import mock
 import datetime as dt
 
-from opyplus import Simulation
+import pandas as pd
+from pandas.testing import assert_frame_equal, assert_index_equal
+
+from opyplus import Simulation, StandardOutput
+from opyplus.standard_output.output_environment import FREQUENCIES, container_characteristics, HOURLY
+from opyplus.standard_output.output_variable import OutputVariable
+from opyplus.standard_output.data_containers import DataContainer
+from opyplus.standard_output.frame_cache import get_default_storage, PARQUET
 from tests.util import iter_eplus_versions
 from tests.resources import Resources
 
@@ -38,6 +49,193 @@ class StandardOutputTest(unittest.TestCase):
                     len(df)
                 )
 
+    def test_fast_engine(self):
+        for eplus_version_str in sorted(os.listdir(Resources.SimulationsOutputs.one_zone_uncontrolled)):
+            with self.subTest(eplus_version=eplus_version_str):
+                eso_path = os.path.join(
+                    Resources.SimulationsOutputs.one_zone_uncontrolled,
+                    eplus_version_str,
+                    "eplusout.eso"
+                )
+                default_so = StandardOutput(eso_path, start_year=2013)
+                fast_so = StandardOutput(eso_path, start_year=2013, engine="fast")
+                self.assertEqual(default_so.get_info(), fast_so.get_info())
+                for frequency in FREQUENCIES:
+                    default_df = default_so.get_data(frequency=frequency)
+                    fast_df = fast_so.get_data(frequency=frequency)
+                    if default_df is None:
+                        self.assertIsNone(fast_df)
+                    else:
+                        assert_frame_equal(default_df, fast_df)
+
+    def test_datetime_index(self):
+        # year rollover: 2 days, from december 31 to january 1
+        container = DataContainer(
+            [OutputVariable("7", "environment", "Site Outdoor Air Drybulb Temperature", "C", HOURLY, "")],
+            HOURLY,
+            container_characteristics[HOURLY]["instant_columns"],
+            pandas_freq=container_characteristics[HOURLY]["pandas_freq"]
+        )
+        for month, day in ((12, 31), (1, 1)):
+            for hour in range(24):
+                container.register_instant(month, day, hour, 0, 60, 0, "Tuesday")
+                container.register_value("7", float(hour))
+        container.build_df()
+        container.create_datetime_index(2013)
+        assert_index_equal(pd.date_range("2013-12-31", periods=48, freq="h"), container.df.index)
+        self.assertEqual(
+            ["month", "day", "hour", "minute", "end_minute", "dst", "day_type"] +
+            ["environment,Site Outdoor Air Drybulb Temperature"],
+            list(container.df.columns)
+        )
+
+        # out of range hours and minutes are not rolled over to next or previous day
+        for hour, minute in ((24, 0), (-1, 0), (0, 60)):
+            container = DataContainer(
+                [OutputVariable("7", "environment", "Site Outdoor Air Drybulb Temperature", "C", HOURLY, "")],
+                HOURLY,
+                container_characteristics[HOURLY]["instant_columns"],
+                pandas_freq=container_characteristics[HOURLY]["pandas_freq"]
+            )
+            container.register_instant(1, 1, hour, minute, 60, 0, "Tuesday")
+            container.register_value("7", 0.)
+            container.build_df()
+            with self.assertRaises(ValueError):
+                container.create_datetime_index(2013)
+
+    def test_selective_loading(self):
+        variables = [
+            "Environment,Site Outdoor Air Drybulb Temperature",
+            "zone one,Zone Mean Air Temperature"
+        ]
+        for eplus_version_str in sorted(os.listdir(Resources.SimulationsOutputs.one_zone_uncontrolled)):
+            eso_path = os.path.join(
+                Resources.SimulationsOutputs.one_zone_uncontrolled,
+                eplus_version_str,
+                "eplusout.eso"
+            )
+            full_so = StandardOutput(eso_path)
+            environment_title = tuple(full_so._environments_by_title)[-1].upper()
+            for engine in ("default", "fast"):
+                with self.subTest(eplus_version=eplus_version_str, engine=engine):
+                    so = StandardOutput(
+                        eso_path,
+                        engine=engine,
+                        variables=variables,
+                        frequencies=["hourly", "daily"],
+                        environments=[environment_title]
+                    )
+                    for frequency in FREQUENCIES:
+                        full_df = full_so.get_data(frequency=frequency)
+                        df = so.get_data(frequency=frequency)
+                        if frequency not in ("hourly", "daily"):
+                            self.assertIsNone(df)
+                            continue
+                        refs = [
+                            var.ref.lower() for var in so._variables_by_freq[frequency]
+                        ]
+                        self.assertTrue(set(refs).issubset({ref.lower() for ref in variables}))
+                        assert_frame_equal(full_df[df.columns], df)
+
+                    # environment filter
+                    so = StandardOutput(eso_path, engine=engine, environments=["unknown"])
+                    self.assertEqual(0, len(so._environments_by_title))
+
+        with self.assertRaises(ValueError):
+            StandardOutput(eso_path, frequencies=["weekly"])
+
+    def test_lazy(self):
+        for eplus_version_str in sorted(os.listdir(Resources.SimulationsOutputs.one_zone_uncontrolled)):
+            with self.subTest(eplus_version=eplus_version_str), tempfile.TemporaryDirectory() as dir_path:
+                # copy eso (index sidecar file is written next to it)
+                eso_path = os.path.join(dir_path, "eplusout.eso")
+                shutil.copy(
+                    os.path.join(Resources.SimulationsOutputs.one_zone_uncontrolled, eplus_version_str, "eplusout.eso"),
+                    eso_path
+                )
+                full_so = StandardOutput(eso_path, start_year=2013)
+                for engine in ("default", "fast"):
+                    lazy_so = StandardOutput(eso_path, start_year=2013, engine=engine, lazy=True)
+                    self.assertTrue(os.path.isfile(eso_path + ".index.json"))
+                    for frequency in FREQUENCIES:
+                        full_df = full_so.get_data(frequency=frequency)
+                        lazy_df = lazy_so.get_data(frequency=frequency)
+                        if full_df is None:
+                            self.assertIsNone(lazy_df)
+                        else:
+                            assert_frame_equal(full_df, lazy_df)
+                    self.assertEqual(full_so.get_info(), lazy_so.get_info())
+
+        with self.assertRaises(ValueError):
+            StandardOutput(io.StringIO(), lazy=True)
+
+    def test_cache(self):
+        for eplus_version_str in sorted(os.listdir(Resources.SimulationsOutputs.one_zone_uncontrolled)):
+            with self.subTest(eplus_version=eplus_version_str), tempfile.TemporaryDirectory() as dir_path:
+                simulation_path = os.path.join(dir_path, "simulation")
+                shutil.copytree(
+                    os.path.join(Resources.SimulationsOutputs.one_zone_uncontrolled, eplus_version_str),
+                    simulation_path
+                )
+                so = StandardOutput(os.path.join(simulation_path, "eplusout.eso"), start_year=2013)
+
+                # to/from cache
+                cache_path = os.path.join(dir_path, "cache")
+                so.to_cache(cache_path, storage="npy")
+                so.to_cache(cache_path, storage="npy")  # cache is replaced
+                cached_so = StandardOutput.from_cache(cache_path)
+                self.assertEqual(so.get_info(), cached_so.get_info())
+                for frequency in FREQUENCIES:
+                    df = so.get_data(frequency=frequency)
+                    if df is None:
+                        self.assertIsNone(cached_so.get_data(frequency=frequency))
+                    else:
+                        assert_frame_equal(df, cached_so.get_data(frequency=frequency))
+
+                # simulation reuses cache (opt-in)
+                s = Simulation(simulation_path)
+                s.get_out_eso()
+                self.assertFalse(os.path.exists(os.path.join(simulation_path, "eplusout.eso.cache")))
+                s.get_out_eso(use_cache=True)
+                self.assertTrue(os.path.isdir(os.path.join(simulation_path, "eplusout.eso.cache")))
+                assert_frame_equal(
+                    StandardOutput(os.path.join(simulation_path, "eplusout.eso")).get_data(),
+                    s.get_out_eso(use_cache=True).get_data()
+                )
+
+                # cache write errors don't prevent from getting parsed eso
+                shutil.rmtree(os.path.join(simulation_path, "eplusout.eso.cache"))
+                with mock.patch.object(StandardOutput, "to_cache", side_effect=ImportError("no parquet engine")):
+                    with self.assertLogs("opyplus.simulation.simulation", level="WARNING"):
+                        df = s.get_out_eso(use_cache=True).get_data()
+                assert_frame_equal(StandardOutput(os.path.join(simulation_path, "eplusout.eso")).get_data(), df)
+
+        # parquet storage
+        with tempfile.TemporaryDirectory() as dir_path:
+            cache_path = os.path.join(dir_path, "cache")
+            if get_default_storage() != PARQUET:
+                # no parquet engine: error is raised and nothing is written
+                with self.assertRaises(ImportError):
+                    so.to_cache(cache_path, storage="parquet")
+                self.assertEqual([], os.listdir(dir_path))
+            else:
+                so.to_cache(cache_path, storage="parquet")
+                cached_so = StandardOutput.from_cache(cache_path)
+                self.assertEqual(so.get_info(), cached_so.get_info())
+                for frequency in FREQUENCIES:
+                    df = so.get_data(frequency=frequency)
+                    if df is None:
+                        self.assertIsNone(cached_so.get_data(frequency=frequency))
+                    else:
+                        assert_frame_equal(df, cached_so.get_data(frequency=frequency))
+
+        # other directories are not overwritten
+        with tempfile.TemporaryDirectory() as dir_path:
+            with open(os.path.join(dir_path, "file.txt"), "w"):
+                pass
+            with self.assertRaises(ValueError):
+                so.to_cache(dir_path)
+
     @unittest.skip("not relevant")
     def test_start_dt(self):
         for eplus_version in iter_eplus_versions(self):
@@ -6,7 +6,7 @@ import io
 import pandas as pd
 
 from opyplus.conf import CONF
-from opyplus import WeatherData
+from opyplus import WeatherData, DatetimeInstantsCreationError
 from opyplus.compatibility import get_eplus_base_dir_path
 from tests.util import assert_epw_equal, iter_eplus_versions  # todo: improve epw-equal and use it
 
@@ -53,6 +53,38 @@ class EPlusWeatherData(unittest.TestCase):
         sf_diff, other_diff = compare_sf(sf_content, with_datetimes, datetimes_where_used=True)
         self.assertEqual(sf_diff, other_diff)
 
+    def test_iter_chunks(self):
+        weather_data = WeatherData.load(Resources.Epw.san_fransisco_tmy3)
+        chunks = list(WeatherData.iter_chunks(Resources.Epw.san_fransisco_tmy3, chunksize=1000))
+        self.assertEqual(9, len(chunks))
+        assert_frame_equal(
+            weather_data.get_weather_series(),
+            pd.concat([chunk.get_weather_series() for chunk in chunks])
+        )
+        for chunk in chunks:
+            self.assertEqual(weather_data.get_info().split("\n")[:-1], chunk.get_info().split("\n")[:-1])
+
+    def test_datetime_instants(self):
+        wd = WeatherData.load(Resources.Epw.san_fransisco_tmy3, create_datetime_instants=True, start_year=2013)
+        # right convention: first instant (hour 1) is 01:00
+        pd.testing.assert_index_equal(
+            pd.date_range("2013-01-01 01:00", periods=8760, freq="h"),
+            wd.get_weather_series().index
+        )
+
+        # leap year
+        with self.assertRaises(DatetimeInstantsCreationError):
+            WeatherData.load(Resources.Epw.san_fransisco_tmy3, create_datetime_instants=True, start_year=2012)
+
+        # hours must be in 1..24 (not rolled over to next or previous day)
+        for hour_offset in (-1, 1):
+            wd = WeatherData.load(Resources.Epw.san_fransisco_tmy3)
+            weather_series = wd.get_weather_series()
+            weather_series["hour"] += hour_offset
+            wd.set_weather_series(weather_series)
+            with self.assertRaises(ValueError):
+                wd.create_datetime_instants(start_year=2013)
+
 
 def compare_sf(sf_content, other_content, datetimes_where_used=False):
     return _SfToEpwComparator(sf_content, other_content, datetimes_where_used=datetimes_where_used).diffs